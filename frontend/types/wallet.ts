@@ -14,6 +14,7 @@ export interface WalletVerificationStatus {
 export interface WalletVerificationResponse {
   success: boolean;
   message: string;
+  isVerified?: boolean;
   requestId: string;
 }
 
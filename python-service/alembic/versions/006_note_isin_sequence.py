@@ -0,0 +1,70 @@
+"""Add sequence for collision-free ISIN generation
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-01-12 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create sequence used to allocate mock ISINs (USMOC + 6 digits + check digit). Legacy ISINs
+    # were random USMOCK + 6 digits; a digit in the sixth position keeps the two apart, so the
+    # sequence starts at 1 with its whole range available instead of being seeded past legacy values
+    op.execute("CREATE SEQUENCE note_isin_seq MINVALUE 1 MAXVALUE 999999 NO CYCLE")
+
+    # ISO 6166 check digit: letters expand to two digits (A=10 ... Z=35), then Luhn over the
+    # result, doubling every second digit starting from the rightmost
+    op.execute("""
+        CREATE OR REPLACE FUNCTION isin_check_digit(body text) RETURNS text AS $$
+        DECLARE
+            digits text := '';
+            total integer := 0;
+            d integer;
+            ch text;
+        BEGIN
+            FOR i IN 1..length(body) LOOP
+                ch := substr(body, i, 1);
+                IF ch ~ '[0-9]' THEN
+                    digits := digits || ch;
+                ELSE
+                    digits := digits || (ascii(upper(ch)) - 55)::text;
+                END IF;
+            END LOOP;
+            FOR i IN 1..length(digits) LOOP
+                d := substr(digits, length(digits) - i + 1, 1)::integer;
+                IF i % 2 = 1 THEN
+                    d := d * 2;
+                    IF d > 9 THEN
+                        d := d - 9;
+                    END IF;
+                END IF;
+                total := total + d;
+            END LOOP;
+            RETURN ((10 - total % 10) % 10)::text;
+        END;
+        $$ LANGUAGE plpgsql IMMUTABLE
+    """)
+
+    # Draws one serial and appends its check digit; nextval must run exactly once per ISIN,
+    # so the body is built in a subquery rather than repeated in the expression
+    op.execute("""
+        CREATE OR REPLACE FUNCTION next_mock_isin() RETURNS text AS $$
+            SELECT body || isin_check_digit(body)
+            FROM (SELECT 'USMOC' || lpad(nextval('note_isin_seq')::text, 6, '0') AS body) AS s
+        $$ LANGUAGE sql VOLATILE
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS next_mock_isin()")
+    op.execute("DROP FUNCTION IF EXISTS isin_check_digit(text)")
+    op.execute("DROP SEQUENCE IF EXISTS note_isin_seq")
@@ -0,0 +1,35 @@
+"""Add composite indexes backing note listing filters and sorts
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-01-12 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Trigram support so ISIN partial-match (ILIKE '%...%') can use an index
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ni_wallet_issued ON note_issuances (wallet_address, issued_at DESC)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ni_status_issued ON note_issuances (status, issued_at DESC)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ni_maturity ON note_issuances (maturity_date)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ni_isin_trgm ON note_issuances USING gin (isin gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_ni_isin_trgm")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_ni_maturity")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_ni_status_issued")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_ni_wallet_issued")
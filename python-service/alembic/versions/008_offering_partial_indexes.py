@@ -0,0 +1,36 @@
+"""Add partial indexes for open offerings and pending orders
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-01-13 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # Serves GET /offerings: open notes newest first, keyset-seekable on (issued_at, id)
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ni_open_issued "
+            "ON note_issuances (issued_at DESC, id DESC) WHERE offering_status = 'open'"
+        )
+        # Serves settlement: the pending orders of one note
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_pending_note "
+            "ON orders (note_id) WHERE status = 'pending'"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_orders_pending_note")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_ni_open_issued")
@@ -0,0 +1,98 @@
+"""Keep protection layer totals on note_issuances
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-01-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Per-layer protection totals, read by the offerings listing and risk breakdown
+    # instead of aggregating collateral/guarantees/insurance on every request
+    op.add_column('note_issuances', sa.Column('collateral_coverage_cents', sa.BigInteger(), server_default='0', nullable=False, comment='Sum of active collateral valuations in cents'))
+    op.add_column('note_issuances', sa.Column('guarantee_coverage_cents', sa.BigInteger(), server_default='0', nullable=False, comment='Sum of active guarantee coverage in cents (uncapped)'))
+    op.add_column('note_issuances', sa.Column('insurance_pool_cents', sa.BigInteger(), server_default='0', nullable=False, comment='Sum of insurance pool contributions in cents'))
+
+    # Recompute one note's totals (guarantee coverage truncates per guarantee, like the risk engine)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION refresh_note_protection(p_note_id integer) RETURNS void AS $$
+        BEGIN
+            UPDATE note_issuances n SET
+                collateral_coverage_cents = (
+                    SELECT COALESCE(SUM(c.valuation_cents), 0) FROM collateral_assets c
+                    WHERE c.note_id = n.id AND c.status = 'active'
+                ),
+                guarantee_coverage_cents = (
+                    SELECT COALESCE(SUM(n.amount::bigint * g.coverage_percent / 100), 0) FROM guarantees g
+                    WHERE g.note_id = n.id AND g.enforcement_status = 'active'
+                ),
+                insurance_pool_cents = (
+                    SELECT COALESCE(SUM(i.amount_cents), 0) FROM insurance_pool_contributions i
+                    WHERE i.note_id = n.id
+                )
+            WHERE n.id = p_note_id;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION note_protection_layer_changed() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM refresh_note_protection(OLD.note_id);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND (TG_OP = 'INSERT' OR NEW.note_id IS DISTINCT FROM OLD.note_id) THEN
+                PERFORM refresh_note_protection(NEW.note_id);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION note_amount_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM refresh_note_protection(NEW.id);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    for table in ('collateral_assets', 'guarantees', 'insurance_pool_contributions'):
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_protection "
+            f"AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION note_protection_layer_changed()"
+        )
+    # Guarantee coverage is a share of the face value
+    op.execute(
+        "CREATE TRIGGER trg_note_issuances_amount_protection "
+        "AFTER UPDATE OF amount ON note_issuances "
+        "FOR EACH ROW WHEN (NEW.amount IS DISTINCT FROM OLD.amount) "
+        "EXECUTE FUNCTION note_amount_changed()"
+    )
+
+    # Backfill existing notes
+    op.execute("SELECT refresh_note_protection(id) FROM note_issuances")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_note_issuances_amount_protection ON note_issuances")
+    for table in ('insurance_pool_contributions', 'guarantees', 'collateral_assets'):
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_protection ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS note_amount_changed()")
+    op.execute("DROP FUNCTION IF EXISTS note_protection_layer_changed()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_note_protection(integer)")
+
+    op.drop_column('note_issuances', 'insurance_pool_cents')
+    op.drop_column('note_issuances', 'guarantee_coverage_cents')
+    op.drop_column('note_issuances', 'collateral_coverage_cents')
@@ -0,0 +1,44 @@
+"""Create match_jobs table for background order matching
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-01-16 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'match_jobs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('note_id', sa.Integer(), nullable=False),
+        sa.Column('mode', sa.String(length=20), nullable=False, comment='Matching mode: continuous or uniform_price'),
+        sa.Column('status', sa.String(length=20), server_default='queued', nullable=False, comment='Status: queued, running, completed, failed'),
+        sa.Column('trades_executed', sa.Integer(), nullable=True),
+        sa.Column('total_quantity', sa.Integer(), nullable=True, comment='Total traded quantity in cents'),
+        sa.Column('clearing_price', sa.Integer(), nullable=True, comment='Auction clearing price in cents (uniform_price mode)'),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('request_id', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['note_id'], ['note_issuances.id'], ondelete='CASCADE')
+    )
+    op.execute("COMMENT ON TABLE match_jobs IS 'Order matching runs executed in the background'")
+
+    op.create_index(op.f('ix_match_jobs_id'), 'match_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_match_jobs_note_id'), 'match_jobs', ['note_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_match_jobs_note_id'), table_name='match_jobs')
+    op.drop_index(op.f('ix_match_jobs_id'), table_name='match_jobs')
+    op.drop_table('match_jobs')
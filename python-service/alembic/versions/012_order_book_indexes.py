@@ -0,0 +1,44 @@
+"""Add partial indexes serving each side of the order book in price-time order
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-01-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # Order matching reads a note's pending bids by price desc (market orders first), then time
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_matching_buy "
+            "ON orders (note_id, price DESC NULLS FIRST, created_at) "
+            "WHERE side = 'buy' AND status = 'pending'"
+        )
+        # ...and its pending asks by price asc (market orders first), then time
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_matching_sell "
+            "ON orders (note_id, price ASC NULLS FIRST, created_at) "
+            "WHERE side = 'sell' AND status = 'pending'"
+        )
+        # Superseded: matching no longer reads pending orders in plain arrival order
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_orders_note_status_created")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orders_note_status_created "
+            "ON orders (note_id, status, created_at)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_orders_matching_sell")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_orders_matching_buy")
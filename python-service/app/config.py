@@ -16,6 +16,11 @@ class Settings(BaseSettings):
     
     # Database Configuration
     database_url: str = ""
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30  # Seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # Seconds before a pooled connection is replaced
+    db_use_pgbouncer: bool = False  # PgBouncer pools connections instead of SQLAlchemy
     
     # CORS Configuration
     allowed_origins: List[str] = ["https://micropaper.vercel.app"]
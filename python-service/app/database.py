@@ -4,8 +4,12 @@ Database connection and pooling configuration
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import NullPool
+from sqlalchemy import text
+from fastapi import HTTPException, status
 from app.config import settings
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +18,11 @@ engine = None
 async_session_maker = None
 Base = declarative_base()
 
+# A successful health probe is trusted for this many seconds before the
+# database is queried again (liveness probes fire every few seconds)
+HEALTH_PROBE_TTL_SECONDS = 5.0
+_last_healthy_at = 0.0
+
 
 async def init_db():
     """Initialize database connection pool"""
@@ -28,12 +37,27 @@ async def init_db():
     if database_url.startswith("postgresql://"):
         database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
     
+    if settings.db_use_pgbouncer:
+        # PgBouncer multiplexes connections across workers; its transaction pooling
+        # cannot keep asyncpg's per-connection prepared statements
+        pool_options = {
+            "poolclass": NullPool,
+            "connect_args": {"statement_cache_size": 0}
+        }
+    else:
+        pool_options = {
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout,
+            "pool_recycle": settings.db_pool_recycle,
+            "pool_use_lifo": True  # Reuse the most recent connections so idle ones can time out
+        }
+    
     engine = create_async_engine(
         database_url,
-        pool_size=10,
-        max_overflow=20,
         pool_pre_ping=True,  # Verify connections before using
-        echo=settings.environment == "development"
+        echo=settings.environment == "development",
+        **pool_options
     )
     
     async_session_maker = async_sessionmaker(
@@ -54,9 +78,23 @@ async def close_db():
 
 
 async def get_db():
-    """Dependency for getting database session"""
+    """Dependency for getting database session (503 if the database is not initialized)"""
+    if not async_session_maker:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database not available"
+        )
+    
+    async with async_session_maker() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+async def get_optional_db():
+    """Dependency for getting database session, or None for callers that degrade gracefully"""
     if not async_session_maker:
-        # If database not initialized, return None (routes will handle gracefully)
         yield None
         return
     
@@ -66,3 +104,23 @@ async def get_db():
         finally:
             await session.close()
 
+
+
+async def probe_database() -> str:
+    """Return database status for health checks, reusing a recent successful probe"""
+    global _last_healthy_at
+    
+    if not engine:
+        return "disconnected"
+    
+    if time.monotonic() - _last_healthy_at < HEALTH_PROBE_TTL_SECONDS:
+        return "connected"
+    
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception:
+        return "error"
+    
+    _last_healthy_at = time.monotonic()
+    return "connected"
@@ -2,8 +2,8 @@
 SQLAlchemy database models
 """
 
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, Text, ForeignKey, Enum as SQLEnum, BigInteger
-from sqlalchemy.sql import func
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, Text, ForeignKey, Enum as SQLEnum, BigInteger, Sequence, Index
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 from app.database import Base
 import enum
@@ -36,6 +36,14 @@ class OrderSideEnum(str, enum.Enum):
     SELL = "sell"
 
 
+class MatchJobStatusEnum(str, enum.Enum):
+    """Background match job status enumeration"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 class InvestorTierEnum(str, enum.Enum):
     """Investor tier enumeration - values match database enum"""
     RETAIL = "retail"
@@ -43,6 +51,10 @@ class InvestorTierEnum(str, enum.Enum):
     INSTITUTIONAL = "institutional"
 
 
+# Serial backing mock ISIN generation (USMOC + 6 zero-padded digits + check digit)
+note_isin_seq = Sequence("note_isin_seq", minvalue=1, maxvalue=999999, metadata=Base.metadata)
+
+
 class WalletVerification(Base):
     """Wallet verification status table"""
     __tablename__ = "wallet_verifications"
@@ -75,9 +87,34 @@ class NoteIssuance(Base):
     min_subscription_amount = Column(Integer, nullable=False, comment="Minimum subscription amount in cents")
     offering_status = Column(String(20), nullable=False, default=OfferingStatusEnum.CLOSED.value)
     
+    # Protection layer totals, kept current by database triggers (see migration 010)
+    collateral_coverage_cents = Column(BigInteger, nullable=False, server_default="0", comment="Sum of active collateral valuations in cents")
+    guarantee_coverage_cents = Column(BigInteger, nullable=False, server_default="0", comment="Sum of active guarantee coverage in cents (uncapped)")
+    insurance_pool_cents = Column(BigInteger, nullable=False, server_default="0", comment="Sum of insurance pool contributions in cents")
+    
     # Relationships
     orders = relationship("Order", back_populates="note", cascade="all, delete-orphan")
     holdings = relationship("InvestorHolding", back_populates="note", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Note listing filters and sorts (see migration 007)
+        Index("ix_ni_wallet_issued", wallet_address, issued_at.desc()),
+        Index("ix_ni_status_issued", status, issued_at.desc()),
+        Index("ix_ni_maturity", maturity_date),
+        # ISIN partial match (ILIKE '%...%'); needs the pg_trgm extension
+        Index(
+            "ix_ni_isin_trgm",
+            isin,
+            postgresql_using="gin",
+            postgresql_ops={"isin": "gin_trgm_ops"}
+        ),
+        # Open offerings newest first, keyset-seekable on (issued_at, id) (see migration 008)
+        Index(
+            "ix_ni_open_issued",
+            issued_at.desc(), id.desc(),
+            postgresql_where=text("offering_status = 'open'")
+        ),
+    )
 
 
 class ComplianceAuditLog(Base):
@@ -107,6 +144,11 @@ class InvestorHolding(Base):
     
     # Relationships
     note = relationship("NoteIssuance", back_populates="holdings")
+    
+    __table_args__ = (
+        # Holdings of one wallet in one note (sell-side checks, order matching)
+        Index("ix_investor_holdings_wallet_note", "wallet_address", "note_id"),
+    )
 
 
 class Order(Base):
@@ -126,6 +168,23 @@ class Order(Base):
     
     # Relationships
     note = relationship("NoteIssuance", back_populates="orders")
+    
+    __table_args__ = (
+        Index("ix_orders_note_status", "note_id", "status"),
+        # The pending orders of one note (settlement)
+        Index("ix_orders_pending_note", note_id, postgresql_where=text("status = 'pending'")),
+        # Each side of a note's pending book in price-time order (order matching) without a sort
+        Index(
+            "ix_orders_matching_buy",
+            note_id, price.desc().nulls_first(), created_at,
+            postgresql_where=text("side = 'buy' AND status = 'pending'")
+        ),
+        Index(
+            "ix_orders_matching_sell",
+            note_id, price.asc().nulls_first(), created_at,
+            postgresql_where=text("side = 'sell' AND status = 'pending'")
+        ),
+    )
 
 
 class CollateralAsset(Base):
@@ -196,3 +255,19 @@ class Trade(Base):
     buy_order = relationship("Order", foreign_keys=[buy_order_id])
     sell_order = relationship("Order", foreign_keys=[sell_order_id])
 
+
+class MatchJob(Base):
+    """Match jobs table - tracks order matching runs executed in the background"""
+    __tablename__ = "match_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    note_id = Column(Integer, ForeignKey('note_issuances.id', ondelete='CASCADE'), nullable=False, index=True)
+    mode = Column(String(20), nullable=False, comment="Matching mode: continuous or uniform_price")
+    status = Column(String(20), nullable=False, default=MatchJobStatusEnum.QUEUED.value, comment="Status: queued, running, completed, failed")
+    trades_executed = Column(Integer, nullable=True)
+    total_quantity = Column(Integer, nullable=True, comment="Total traded quantity in cents")
+    clearing_price = Column(Integer, nullable=True, comment="Auction clearing price in cents (uniform_price mode)")
+    error = Column(Text, nullable=True)
+    request_id = Column(String(255), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
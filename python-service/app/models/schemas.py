@@ -89,6 +89,7 @@ class WalletVerificationResponse(BaseModel):
     """Response model matching WalletVerificationResponse TypeScript interface"""
     success: bool
     message: str
+    is_verified: Optional[bool] = Field(None, alias="isVerified", description="Verification status after the change")
     request_id: Optional[str] = Field(None, alias="requestId")
     
     class Config:
@@ -259,6 +260,7 @@ class OfferingsResponse(BaseModel):
     page: int
     limit: int
     has_more: bool = Field(..., alias="hasMore")
+    next_cursor: Optional[str] = Field(None, alias="nextCursor", description="Cursor for the next page (keyset pagination)")
     
     class Config:
         populate_by_name = True
@@ -316,6 +318,25 @@ class MatchResponse(BaseModel):
     trades_executed: int = Field(..., alias="tradesExecuted")
     total_quantity: int = Field(..., alias="totalQuantity")
     trades: List[TradeResponse] = Field(default_factory=list)
+    clearing_price: Optional[int] = Field(None, alias="clearingPrice", description="Auction clearing price in cents (uniform_price mode only)")
+    request_id: Optional[str] = Field(None, alias="requestId")
+    
+    class Config:
+        populate_by_name = True
+
+
+class MatchJobResponse(BaseModel):
+    """Response model for a background order matching job"""
+    job_id: int = Field(..., alias="jobId")
+    note_id: int = Field(..., alias="noteId")
+    mode: str
+    status: str = Field(..., description="Job status: queued, running, completed, failed")
+    trades_executed: Optional[int] = Field(None, alias="tradesExecuted")
+    total_quantity: Optional[int] = Field(None, alias="totalQuantity")
+    clearing_price: Optional[int] = Field(None, alias="clearingPrice")
+    error: Optional[str] = None
+    created_at: str = Field(..., alias="createdAt")
+    completed_at: Optional[str] = Field(None, alias="completedAt")
     request_id: Optional[str] = Field(None, alias="requestId")
     
     class Config:
@@ -10,7 +10,7 @@ from sqlalchemy import select, func, and_, desc, asc
 import json
 import logging
 
-from app.database import get_db
+from app.database import get_db, get_optional_db, probe_database
 
 logger = logging.getLogger(__name__)
 from app.models.database import WalletVerification, ComplianceAuditLog, NoteIssuance
@@ -26,6 +26,7 @@ from app.models.schemas import (
     WalletDetailsResponse
 )
 from app.utils.compliance_checks import validate_investment_eligibility
+from app.services.caches import wallet_cache
 
 router = APIRouter()
 
@@ -35,10 +36,9 @@ def format_datetime(dt: datetime) -> str:
     if dt is None:
         return ""
     if dt.tzinfo is not None:
-        dt = dt.astimezone(timezone.utc)
-    if dt.microsecond:
-        return dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
-    return dt.strftime("%Y-%m-%dT%H:%M:%S") + "Z"
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    # isoformat runs in C; milliseconds are only shown when present
+    return dt.isoformat(timespec="milliseconds" if dt.microsecond else "seconds") + "Z"
 
 
 def _validate_wallet_address(wallet_address: str) -> str:
@@ -53,18 +53,9 @@ def _validate_wallet_address(wallet_address: str) -> str:
 
 # Health and info endpoints (must come before parameterized routes)
 @router.get("/health")
-async def health_check(db: AsyncSession = Depends(get_db)):
+async def health_check():
     """Health check endpoint for compliance service"""
-    db_status = "connected" if db else "disconnected"
-    
-    # Test database connection if available
-    if db:
-        try:
-            from sqlalchemy import text
-            await db.execute(text("SELECT 1"))
-            db_status = "connected"
-        except Exception:
-            db_status = "error"
+    db_status = await probe_database()
     
     return {
         "status": "healthy",
@@ -105,7 +96,7 @@ async def get_info():
 @router.get("/stats", response_model=ComplianceStatsResponse)
 async def get_stats(
     request: Request,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_optional_db)
 ):
     """
     Get compliance registry statistics (admin/debugging)
@@ -148,7 +139,7 @@ async def get_stats(
 @router.get("/verified", response_model=VerifiedWalletsResponse)
 async def get_verified_wallets(
     request: Request,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_optional_db)
 ):
     """
     Get list of all verified wallets (admin/debugging)
@@ -194,12 +185,6 @@ async def get_audit_logs(
     """
     request_id = request.headers.get("X-Request-ID")
     
-    if not db:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Database not available"
-        )
-    
     try:
         # Build base query
         query = select(ComplianceAuditLog)
@@ -314,12 +299,6 @@ async def get_wallet_details(
     request_id = request.headers.get("X-Request-ID")
     normalized_address = _validate_wallet_address(wallet_address)
     
-    if not db:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Database not available"
-        )
-    
     try:
         # Get wallet verification status
         wallet_result = await db.execute(
@@ -391,7 +370,7 @@ async def get_wallet_details(
 async def check_status(
     request: Request,
     wallet_address: str = Path(..., description="Ethereum wallet address"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_optional_db)
 ):
     """
     Check verification status for a wallet address
@@ -433,7 +412,7 @@ async def check_status(
         logger.warning(f"Error logging audit trail: {e}", extra={"request_id": request_id})
         # Log error but don't fail the request
         try:
-        await db.rollback()
+            await db.rollback()
         except Exception as rollback_error:
             logger.error(f"Error during rollback: {rollback_error}", extra={"request_id": request_id})
     
@@ -472,12 +451,6 @@ async def verify_wallet(
     normalized_address = _validate_wallet_address(wallet_address)
     request_id = request.headers.get("X-Request-ID")
     
-    if not db:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Database not available"
-        )
-    
     # Parse request body if provided
     tier = None
     jurisdiction = None
@@ -520,9 +493,10 @@ async def verify_wallet(
         )
         db.add(audit_log)
         await db.commit()
+        wallet_cache.invalidate(normalized_address)
     except Exception as e:
         try:
-        await db.rollback()
+            await db.rollback()
         except Exception as rollback_error:
             logger.error(f"Error during rollback: {rollback_error}", extra={"request_id": request_id})
         logger.error(f"Error verifying wallet: {e}", extra={"request_id": request_id}, exc_info=True)
@@ -534,6 +508,7 @@ async def verify_wallet(
     return WalletVerificationResponse(
         success=True,
         message=f"Wallet {wallet_address} marked as verified",
+        is_verified=True,
         request_id=request_id
     )
 
@@ -550,12 +525,6 @@ async def unverify_wallet(
     normalized_address = _validate_wallet_address(wallet_address)
     request_id = request.headers.get("X-Request-ID")
     
-    if not db:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Database not available"
-        )
-    
     # Update in database
     from sqlalchemy import select
     result = await db.execute(
@@ -583,9 +552,10 @@ async def unverify_wallet(
         )
         db.add(audit_log)
         await db.commit()
+        wallet_cache.invalidate(normalized_address)
     except Exception as e:
         try:
-        await db.rollback()
+            await db.rollback()
         except Exception as rollback_error:
             logger.error(f"Error during rollback: {rollback_error}", extra={"request_id": request_id})
         logger.error(f"Error unverifying wallet: {e}", extra={"request_id": request_id}, exc_info=True)
@@ -597,6 +567,7 @@ async def unverify_wallet(
     return WalletVerificationResponse(
         success=True,
         message=f"Wallet {wallet_address} marked as unverified",
+        is_verified=False,
         request_id=request_id
     )
 
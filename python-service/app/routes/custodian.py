@@ -2,15 +2,15 @@
 Custodian API routes
 """
 
-from fastapi import APIRouter, HTTPException, status, Depends, Request, Query, Path
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Path
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 from datetime import datetime, timezone, timedelta
-from sqlalchemy import select, func, and_, or_, desc, asc
-import random
+from sqlalchemy import select, insert, func, and_, or_, desc, asc, text
 import logging
 
-from app.database import get_db
+from app.database import get_db, probe_database
+from app.services.caches import offerings_cache, note_cache
 from app.models.database import NoteIssuance, CurrencyEnum, OfferingStatusEnum
 from app.models.schemas import (
     NoteIssuanceRequest, 
@@ -26,85 +26,119 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+_UTC = timezone.utc
 
-@router.post("/issue", response_model=NoteIssuanceResponse)
-async def issue_note(
-    request: NoteIssuanceRequest,
-    request_obj: Request,
-    db: AsyncSession = Depends(get_db)
-):
+# Sortable columns for get_notes (built once at import rather than per request)
+_SORT_FIELDS = {
+    "issued_at": NoteIssuance.issued_at,
+    "maturity_date": NoteIssuance.maturity_date,
+    "amount": NoteIssuance.amount,
+    "status": NoteIssuance.status,
+    "wallet_address": NoteIssuance.wallet_address,
+}
+_ORDER_FN = {"asc": asc, "desc": desc}
+
+_VALID_STATUSES = frozenset({"issued", "redeemed", "expired"})
+
+ISIN_LENGTH = 12
+
+# Upper bound on notes accepted by /issue/batch in a single INSERT
+MAX_BATCH_ISSUE = 500
+
+
+def _next_isin():
     """
-    Issue a traditional note
-    
-    This endpoint simulates custodian issuing a traditional note when a token is minted.
+    SQL expression producing the next mock ISIN in ISO 6166 layout: USMOC + 6-digit
+    serial drawn from note_isin_seq + Luhn check digit (see migration 006)
     """
-    if not db:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Database not available"
-        )
+    return func.next_mock_isin()
+
+
+def _isin_filter(isin: str):
+    """
+    Build the ISIN filter condition for get_notes.
     
-    # Normalize wallet address
-    wallet_address = request.wallet_address.lower()
+    A complete 12-character ISIN is matched exactly through the unique b-tree
+    index. Anything shorter is a partial match: ILIKE '%...%' is served by the
+    ix_ni_isin_trgm GIN index once the term is at least 3 characters long
+    (shorter terms have no trigrams and fall back to a scan).
+    """
+    isin = isin.strip().upper()
+    if len(isin) == ISIN_LENGTH:
+        return NoteIssuance.isin == isin
     
+    # Sanitize input: escape SQL wildcards to prevent injection
+    sanitized_isin = isin.replace('%', '\\%').replace('_', '\\_')
+    return NoteIssuance.isin.ilike(f"%{sanitized_isin}%")
+
+
+def _note_values(request: NoteIssuanceRequest, issued_at: datetime) -> dict:
+    """Validate an issuance request and build the column values for its INSERT"""
     # Parse maturity date with proper error handling
     try:
-    maturity_date = datetime.fromisoformat(request.maturity_date.replace('Z', '+00:00'))
+        maturity_date = datetime.fromisoformat(request.maturity_date.replace('Z', '+00:00'))
     except (ValueError, AttributeError) as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid maturity date format: {str(e)}"
         )
     
-    # Generate mock ISIN following ISO 6166 format
-    country_code = "US"
-    prefix = "MOCK"
-    random_number = random.randint(10000, 99999)
-    check_digit = random.randint(0, 9)
-    isin = f"{country_code}{prefix}{random_number}{check_digit}"
+    # Parse currency enum
+    currency = CurrencyEnum.USD
+    if hasattr(request, 'currency') and request.currency:
+        try:
+            currency = CurrencyEnum(request.currency.upper())
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid currency: {request.currency}. Must be USD or USDC"
+            )
+    
+    return {
+        # ISIN is allocated from note_isin_seq inside the INSERT itself, so
+        # generation and storage happen in one roundtrip and can never collide
+        "isin": _next_isin(),
+        "wallet_address": request.wallet_address.lower(),
+        "amount": request.amount,
+        "maturity_date": maturity_date,
+        "status": "issued",
+        "issued_at": issued_at,
+        # Settlement Layer fields
+        "interest_rate_bps": getattr(request, 'interest_rate_bps', 500),  # Default 5.00% (500 basis points)
+        "currency": currency,
+        "min_subscription_amount": getattr(request, 'min_subscription_amount', 10000),  # Default $100 minimum
+        "offering_status": OfferingStatusEnum.OPEN.value  # New notes are open for investment
+    }
+
+
+@router.post("/issue", response_model=NoteIssuanceResponse)
+async def issue_note(
+    request: NoteIssuanceRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Issue a traditional note
     
-    issued_at = datetime.now(timezone.utc)
+    This endpoint simulates custodian issuing a traditional note when a token is minted.
+    """
+    issued_at = datetime.now(_UTC)
+    values = _note_values(request, issued_at)
     
     # Store in database
     try:
-        # Parse currency enum
-        currency = CurrencyEnum.USD
-        if hasattr(request, 'currency') and request.currency:
-            try:
-                currency = CurrencyEnum(request.currency.upper())
-            except ValueError:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Invalid currency: {request.currency}. Must be USD or USDC"
-                )
-        
-        note_issuance = NoteIssuance(
-            isin=isin,
-            wallet_address=wallet_address,
-            amount=request.amount,
-            maturity_date=maturity_date,
-            status="issued",
-            issued_at=issued_at,
-            # Settlement Layer fields
-            interest_rate_bps=getattr(request, 'interest_rate_bps', 500),  # Default 5.00% (500 basis points)
-            currency=currency,
-            min_subscription_amount=getattr(request, 'min_subscription_amount', 10000),  # Default $100 minimum
-            offering_status=OfferingStatusEnum.OPEN.value  # New notes are open for investment
+        result = await db.execute(
+            insert(NoteIssuance).values(**values).returning(NoteIssuance.isin)
         )
-        db.add(note_issuance)
+        isin = result.scalar_one()
         await db.commit()
+        # New notes open for investment immediately
+        offerings_cache.clear()
     except Exception as e:
         try:
-        await db.rollback()
+            await db.rollback()
         except Exception as rollback_error:
             logger.error(f"Error during rollback: {rollback_error}", exc_info=True)
         logger.error(f"Error issuing note: {e}", exc_info=True)
-        # Check if it's a duplicate ISIN error
-        if "unique constraint" in str(e).lower() or "duplicate" in str(e).lower():
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Note with this ISIN already exists. Please try again."
-            )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to issue note: {str(e)}"
@@ -113,27 +147,80 @@ async def issue_note(
     return NoteIssuanceResponse(
         isin=isin,
         status="issued",
-        issued_at=issued_at.isoformat() + "Z"
+        issued_at=format_datetime(issued_at)
     )
 
 
+@router.post("/issue/batch", response_model=List[NoteIssuanceResponse])
+async def issue_notes_batch(
+    requests: List[NoteIssuanceRequest],
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Issue multiple traditional notes in a single request
+    
+    All notes are written with one multi-row INSERT ... RETURNING and one commit,
+    so either every note in the batch is issued or none are.
+    """
+    if not requests:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one note is required"
+        )
+    
+    if len(requests) > MAX_BATCH_ISSUE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch size cannot exceed {MAX_BATCH_ISSUE} notes"
+        )
+    
+    issued_at = datetime.now(_UTC)
+    rows = [_note_values(request, issued_at) for request in requests]
+    
+    # Store in database
+    try:
+        result = await db.execute(
+            insert(NoteIssuance)
+            .values(rows)
+            .returning(NoteIssuance.isin, NoteIssuance.issued_at)
+        )
+        issued = result.all()
+        await db.commit()
+        offerings_cache.clear()
+    except Exception as e:
+        try:
+            await db.rollback()
+        except Exception as rollback_error:
+            logger.error(f"Error during rollback: {rollback_error}", exc_info=True)
+        logger.error(f"Error issuing note batch: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to issue notes: {str(e)}"
+        )
+    
+    logger.info(f"Issued batch of {len(issued)} notes")
+    
+    return [
+        NoteIssuanceResponse(
+            isin=isin,
+            status="issued",
+            issued_at=format_datetime(note_issued_at)
+        )
+        for isin, note_issued_at in issued
+    ]
+
+
 def format_datetime(dt: datetime) -> str:
     """Format datetime to ISO 8601 with Z suffix for UTC"""
     if dt is None:
         return ""
     
-    # If timezone-aware, convert to UTC
+    # If timezone-aware, convert to UTC and drop the offset
     if dt.tzinfo is not None:
-        dt = dt.astimezone(timezone.utc)
-    
-    # Format without timezone info, then add Z
-    # Remove microseconds if they exist, keep milliseconds
-    if dt.microsecond:
-        formatted = dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
-    else:
-        formatted = dt.strftime("%Y-%m-%dT%H:%M:%S") + "Z"
+        dt = dt.astimezone(_UTC).replace(tzinfo=None)
     
-    return formatted
+    # isoformat runs in C; keep milliseconds only when there is a fractional second
+    return dt.isoformat(timespec="milliseconds" if dt.microsecond else "seconds") + "Z"
 
 
 def format_note(note: NoteIssuance) -> dict:
@@ -157,10 +244,10 @@ async def get_notes(
     isin: Optional[str] = Query(None, description="Filter by ISIN (partial match)"),
     min_amount: Optional[int] = Query(None, alias="minAmount", description="Minimum amount"),
     max_amount: Optional[int] = Query(None, alias="maxAmount", description="Maximum amount"),
-    issued_from: Optional[str] = Query(None, alias="issuedFrom", description="Issued date from (ISO 8601)"),
-    issued_to: Optional[str] = Query(None, alias="issuedTo", description="Issued date to (ISO 8601)"),
-    maturity_from: Optional[str] = Query(None, alias="maturityFrom", description="Maturity date from (ISO 8601)"),
-    maturity_to: Optional[str] = Query(None, alias="maturityTo", description="Maturity date to (ISO 8601)"),
+    issued_from: Optional[datetime] = Query(None, alias="issuedFrom", description="Issued date from (ISO 8601)"),
+    issued_to: Optional[datetime] = Query(None, alias="issuedTo", description="Issued date to (ISO 8601)"),
+    maturity_from: Optional[datetime] = Query(None, alias="maturityFrom", description="Maturity date from (ISO 8601)"),
+    maturity_to: Optional[datetime] = Query(None, alias="maturityTo", description="Maturity date to (ISO 8601)"),
     expiring_within_days: Optional[int] = Query(None, alias="expiringWithinDays", description="Notes expiring within X days"),
     sort_by: Optional[str] = Query("issued_at", alias="sortBy", description="Sort by field (issued_at, maturity_date, amount, status, wallet_address)"),
     sort_order: Optional[str] = Query("desc", alias="sortOrder", description="Sort order (asc, desc)"),
@@ -171,15 +258,9 @@ async def get_notes(
     """
     Get list of note issuances with advanced filtering, sorting, and pagination
     """
-    if not db:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Database not available"
-        )
-    
     try:
-        # Build base query
-        query = select(NoteIssuance)
+        # Build base query; the window count carries the filtered total on every row
+        query = select(NoteIssuance, func.count().over().label("total"))
         count_query = select(func.count(NoteIssuance.id))
         
         # Apply filters
@@ -189,14 +270,11 @@ async def get_notes(
             conditions.append(NoteIssuance.wallet_address == wallet_address.lower())
         
         if status_filter:
-            # Sanitize input: escape SQL wildcards to prevent injection
-            sanitized_status = status_filter.lower().replace('%', '\\%').replace('_', '\\_')
-            conditions.append(NoteIssuance.status.ilike(sanitized_status))
+            # Statuses are stored lowercase; equality lets ix_ni_status_issued serve the filter
+            conditions.append(NoteIssuance.status == status_filter.lower())
         
         if isin:
-            # Sanitize input: escape SQL wildcards to prevent injection
-            sanitized_isin = isin.replace('%', '\\%').replace('_', '\\_')
-            conditions.append(NoteIssuance.isin.ilike(f"%{sanitized_isin}%"))
+            conditions.append(_isin_filter(isin))
         
         if min_amount is not None:
             conditions.append(NoteIssuance.amount >= min_amount)
@@ -205,47 +283,19 @@ async def get_notes(
             conditions.append(NoteIssuance.amount <= max_amount)
         
         if issued_from:
-            try:
-                issued_from_dt = datetime.fromisoformat(issued_from.replace('Z', '+00:00'))
-                conditions.append(NoteIssuance.issued_at >= issued_from_dt)
-            except ValueError:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid issuedFrom date format"
-                )
+            conditions.append(NoteIssuance.issued_at >= issued_from)
         
         if issued_to:
-            try:
-                issued_to_dt = datetime.fromisoformat(issued_to.replace('Z', '+00:00'))
-                conditions.append(NoteIssuance.issued_at <= issued_to_dt)
-            except ValueError:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid issuedTo date format"
-                )
+            conditions.append(NoteIssuance.issued_at <= issued_to)
         
         if maturity_from:
-            try:
-                maturity_from_dt = datetime.fromisoformat(maturity_from.replace('Z', '+00:00'))
-                conditions.append(NoteIssuance.maturity_date >= maturity_from_dt)
-            except ValueError:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid maturityFrom date format"
-                )
+            conditions.append(NoteIssuance.maturity_date >= maturity_from)
         
         if maturity_to:
-            try:
-                maturity_to_dt = datetime.fromisoformat(maturity_to.replace('Z', '+00:00'))
-                conditions.append(NoteIssuance.maturity_date <= maturity_to_dt)
-            except ValueError:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid maturityTo date format"
-                )
+            conditions.append(NoteIssuance.maturity_date <= maturity_to)
         
         if expiring_within_days is not None:
-            now = datetime.now(timezone.utc)
+            now = datetime.now(_UTC)
             expiry_date = now + timedelta(days=expiring_within_days)
             conditions.append(and_(
                 NoteIssuance.maturity_date >= now,
@@ -257,32 +307,32 @@ async def get_notes(
             query = query.where(and_(*conditions))
             count_query = count_query.where(and_(*conditions))
         
-        # Get total count
-        total_result = await db.execute(count_query)
-        total = total_result.scalar() or 0
-        
         # Apply sorting
-        sort_field_map = {
-            "issued_at": NoteIssuance.issued_at,
-            "maturity_date": NoteIssuance.maturity_date,
-            "amount": NoteIssuance.amount,
-            "status": NoteIssuance.status,
-            "wallet_address": NoteIssuance.wallet_address,
-        }
-        
-        sort_field = sort_field_map.get(sort_by, NoteIssuance.issued_at)
-        if sort_order.lower() == "asc":
-            query = query.order_by(asc(sort_field))
-        else:
-            query = query.order_by(desc(sort_field))
+        sort_field = _SORT_FIELDS.get(sort_by, NoteIssuance.issued_at)
+        order_fn = _ORDER_FN.get(sort_order.lower(), desc)
+        query = query.order_by(order_fn(sort_field))
         
         # Apply pagination
         offset = (page - 1) * limit
         query = query.offset(offset).limit(limit)
         
-        # Execute query
-        result = await db.execute(query)
-        notes = result.scalars().all()
+        # Page and (fallback) count read from one read-only snapshot
+        async with db.begin():
+            await db.execute(text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY"))
+            
+            result = await db.execute(query)
+            rows = result.all()
+            
+            if rows:
+                total = rows[0].total
+            elif offset:
+                # Page past the end returns no rows to read the total from
+                total_result = await db.execute(count_query)
+                total = total_result.scalar() or 0
+            else:
+                total = 0
+            
+            notes = [row[0] for row in rows]
         
         # Format results
         formatted_notes = [format_note(note) for note in notes]
@@ -312,12 +362,6 @@ async def get_note_by_id(
     """
     Get a single note by ID
     """
-    if not db:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Database not available"
-        )
-    
     try:
         result = await db.execute(
             select(NoteIssuance).where(NoteIssuance.id == note_id)
@@ -349,12 +393,6 @@ async def get_note_by_isin(
     """
     Get a single note by ISIN
     """
-    if not db:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Database not available"
-        )
-    
     try:
         result = await db.execute(
             select(NoteIssuance).where(NoteIssuance.isin == isin.upper())
@@ -382,25 +420,17 @@ async def get_note_by_isin(
 async def update_note_status(
     note_id: int = Path(..., description="Note ID"),
     update_request: NoteUpdateRequest = ...,
-    request_obj: Request = ...,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Update note status (e.g., redeem, expire)
     """
-    if not db:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Database not available"
-        )
-    
     # Validate status
-    valid_statuses = ["issued", "redeemed", "expired"]
     new_status = update_request.status.lower()
-    if new_status not in valid_statuses:
+    if new_status not in _VALID_STATUSES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
+            detail="Invalid status. Must be one of: issued, redeemed, expired"
         )
     
     try:
@@ -420,6 +450,8 @@ async def update_note_status(
         note.status = new_status
         
         await db.commit()
+        # Order creation caches per-note fields; drop them so it re-reads the note
+        note_cache.invalidate(note_id)
         await db.refresh(note)
         
         logger.info(f"Note {note_id} status updated from {old_status} to {new_status}")
@@ -432,13 +464,13 @@ async def update_note_status(
         )
     except HTTPException:
         try:
-        await db.rollback()
+            await db.rollback()
         except Exception as rollback_error:
             logger.error(f"Error during rollback: {rollback_error}", exc_info=True)
         raise
     except Exception as e:
         try:
-        await db.rollback()
+            await db.rollback()
         except Exception as rollback_error:
             logger.error(f"Error during rollback: {rollback_error}", exc_info=True)
         logger.error(f"Error updating note status: {e}", exc_info=True)
@@ -451,13 +483,12 @@ async def update_note_status(
 @router.post("/notes/{note_id}/redeem", response_model=NoteUpdateResponse)
 async def redeem_note(
     note_id: int = Path(..., description="Note ID"),
-    request_obj: Request = ...,
     db: AsyncSession = Depends(get_db)
 ):
     """
     Redeem a note (convenience endpoint to set status to 'redeemed')
     """
-    return await update_note_status(note_id, NoteUpdateRequest(status="redeemed"), request_obj, db)
+    return await update_note_status(note_id, NoteUpdateRequest(status="redeemed"), db)
 
 
 @router.get("/stats", response_model=NoteStatsResponse)
@@ -467,36 +498,24 @@ async def get_note_stats(
     """
     Get aggregated statistics about notes
     """
-    if not db:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Database not available"
-        )
-    
     try:
-        # Get total count and amount
-        total_result = await db.execute(
-            select(func.count(NoteIssuance.id), func.sum(NoteIssuance.amount))
-        )
-        total_count, total_amount = total_result.first()
-        total_count = total_count or 0
-        total_amount = total_amount or 0
-        
-        # Get counts by status
-        issued_result = await db.execute(
-            select(func.count(NoteIssuance.id)).where(NoteIssuance.status.ilike("issued"))
+        # Count and sum per status in one grouped scan; totals are the sums over all groups.
+        # Statuses are stored lowercase (see _VALID_STATUSES), so groups match by equality
+        stats_result = await db.execute(
+            select(NoteIssuance.status, func.count(NoteIssuance.id), func.sum(NoteIssuance.amount))
+            .group_by(NoteIssuance.status)
         )
-        issued_count = issued_result.scalar() or 0
-        
-        redeemed_result = await db.execute(
-            select(func.count(NoteIssuance.id)).where(NoteIssuance.status.ilike("redeemed"))
-        )
-        redeemed_count = redeemed_result.scalar() or 0
-        
-        expired_result = await db.execute(
-            select(func.count(NoteIssuance.id)).where(NoteIssuance.status.ilike("expired"))
-        )
-        expired_count = expired_result.scalar() or 0
+        counts_by_status = {}
+        total_count = 0
+        total_amount = 0
+        for note_status, count, amount in stats_result.all():
+            counts_by_status[note_status] = count
+            total_count += count
+            total_amount += amount or 0
+        
+        issued_count = counts_by_status.get("issued", 0)
+        redeemed_count = counts_by_status.get("redeemed", 0)
+        expired_count = counts_by_status.get("expired", 0)
         
         # Calculate average - prevent division by zero
         average_amount = (total_amount / total_count) if total_count > 0 else 0.0
@@ -518,24 +537,15 @@ async def get_note_stats(
 
 
 @router.get("/health")
-async def health_check(db: AsyncSession = Depends(get_db)):
+async def health_check():
     """Health check endpoint for custodian service"""
-    db_status = "connected" if db else "disconnected"
-    
-    # Test database connection if available
-    if db:
-        try:
-            from sqlalchemy import text
-            await db.execute(text("SELECT 1"))
-            db_status = "connected"
-        except Exception:
-            db_status = "error"
+    db_status = await probe_database()
     
     return {
         "status": "healthy",
         "service": "micropaper-custodian",
         "database": db_status,
-        "timestamp": datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+        "timestamp": datetime.now(_UTC).isoformat().replace('+00:00', 'Z'),
         "version": "1.0.0"
     }
 
@@ -549,6 +559,7 @@ async def get_info():
         description="Mock Custodian API for MicroPaper - Simulates traditional note issuance",
         endpoints={
             "issue": "POST /api/mock/custodian/issue",
+            "issueBatch": "POST /api/mock/custodian/issue/batch",
             "getNotes": "GET /api/mock/custodian/notes",
             "getNoteById": "GET /api/mock/custodian/notes/{id}",
             "getNoteByIsin": "GET /api/mock/custodian/notes/by-isin/{isin}",
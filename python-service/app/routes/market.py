@@ -3,13 +3,19 @@ Market API routes - Settlement & Trading Engine
 Handles note offerings, investments, and settlement
 """
 
-from fastapi import APIRouter, HTTPException, status, Depends, Request, Query, Path
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Query, Path, Response, BackgroundTasks
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, desc, asc
-from typing import Optional, List
+from sqlalchemy import select, insert, update, func, and_, desc, asc, tuple_
+from typing import Optional, List, Dict
+from collections import defaultdict
 from datetime import datetime, timezone
+import base64
+import hashlib
 import logging
 
+from app import database
 from app.database import get_db
 from app.models.database import (
     NoteIssuance, 
@@ -17,9 +23,11 @@ from app.models.database import (
     Order, 
     InvestorHolding,
     Trade,
+    MatchJob,
     OfferingStatusEnum,
     OrderStatusEnum,
-    OrderSideEnum
+    OrderSideEnum,
+    MatchJobStatusEnum
 )
 from app.models.schemas import (
     OfferingResponse,
@@ -30,27 +38,144 @@ from app.models.schemas import (
     SettleResponse,
     RiskBreakdownResponse,
     TradeResponse,
-    MatchResponse
+    MatchResponse,
+    MatchJobResponse
 )
 from app.utils.compliance_checks import validate_investment_eligibility
 from app.utils.yield_calculator import YieldCalculator
+from app.services.caches import offerings_cache, note_cache, wallet_cache
 from app.services.risk_engine import RiskEngine
+from app.services.order_writer import order_writer
 from app.middleware.admin_auth import validate_admin_key
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Enum values resolved once instead of per row / per request
+_OFFERING_OPEN = OfferingStatusEnum.OPEN.value
+_OFFERING_SETTLED = OfferingStatusEnum.SETTLED.value
+_ORDER_PENDING = OrderStatusEnum.PENDING.value
+_ORDER_FILLED = OrderStatusEnum.FILLED.value
+_SIDE_BUY = OrderSideEnum.BUY.value
+_SIDE_SELL = OrderSideEnum.SELL.value
+_JOB_QUEUED = MatchJobStatusEnum.QUEUED.value
+_JOB_RUNNING = MatchJobStatusEnum.RUNNING.value
+_JOB_COMPLETED = MatchJobStatusEnum.COMPLETED.value
+_JOB_FAILED = MatchJobStatusEnum.FAILED.value
+
+# List responses are built from already-validated models, so they are dumped
+# straight to JSON bytes (pydantic-core) instead of being re-validated by FastAPI
+_HOLDINGS_ADAPTER = TypeAdapter(List[HoldingResponse])
+
+# Columns read by the offerings listing (fetched as plain rows, not ORM entities)
+_OFFERING_COLUMNS = (
+    NoteIssuance.id,
+    NoteIssuance.isin,
+    NoteIssuance.wallet_address,
+    NoteIssuance.amount,
+    NoteIssuance.maturity_date,
+    NoteIssuance.interest_rate_bps,
+    NoteIssuance.currency,
+    NoteIssuance.min_subscription_amount,
+    NoteIssuance.offering_status,
+    NoteIssuance.issued_at,
+    NoteIssuance.collateral_coverage_cents,
+    NoteIssuance.guarantee_coverage_cents,
+    NoteIssuance.insurance_pool_cents
+)
+
+# Columns read by the holdings listing: the holding plus the note fields it reports
+_HOLDING_COLUMNS = (
+    InvestorHolding.id,
+    InvestorHolding.wallet_address,
+    InvestorHolding.note_id,
+    NoteIssuance.isin,
+    InvestorHolding.quantity_held,
+    InvestorHolding.acquisition_price,
+    InvestorHolding.acquired_at,
+    NoteIssuance.maturity_date,
+    NoteIssuance.interest_rate_bps,
+    NoteIssuance.issued_at
+)
+
+# Trade price used when neither side of a match names one ($100.00 per unit, par)
+_DEFAULT_TRADE_PRICE = 10000
+
+# /match modes: continuous price-time matching, or a single-price call auction
+MATCH_MODE_CONTINUOUS = "continuous"
+MATCH_MODE_UNIFORM_PRICE = "uniform_price"
+
+# Open offerings change on a seconds-to-minutes scale; let clients and edges reuse them briefly
+OFFERINGS_CACHE_CONTROL = "public, max-age=10, stale-while-revalidate=60"
+
 
 def format_datetime(dt: datetime) -> str:
     """Format datetime to ISO 8601 with Z suffix for UTC"""
     if dt is None:
         return ""
     if dt.tzinfo is not None:
-        dt = dt.astimezone(timezone.utc)
-    if dt.microsecond:
-        return dt.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
-    return dt.strftime("%Y-%m-%dT%H:%M:%S") + "Z"
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    # isoformat runs in C; milliseconds are only shown when present
+    return dt.isoformat(timespec="milliseconds" if dt.microsecond else "seconds") + "Z"
+
+
+def encode_offering_cursor(note) -> str:
+    """Encode the (issued_at, id) sort key of the last offering on a page as an opaque cursor"""
+    raw = f"{note.issued_at.isoformat()}|{note.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_offering_cursor(cursor: str):
+    """Decode an offerings cursor back into its (issued_at, id) sort key"""
+    try:
+        issued_at, note_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(issued_at), int(note_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def build_holding_response(
+    holding,
+    maturity_value_cents: Optional[int],
+    apy: Optional[float]
+) -> HoldingResponse:
+    """Build the API representation of a holding row (see _HOLDING_COLUMNS)
+    
+    Values come straight from typed DB columns, so validation is skipped.
+    """
+    return HoldingResponse.model_construct(
+        id=holding.id,
+        wallet_address=holding.wallet_address,
+        note_id=holding.note_id,
+        isin=holding.isin,
+        quantity_held=holding.quantity_held,
+        acquisition_price=holding.acquisition_price,
+        acquired_at=format_datetime(holding.acquired_at),
+        maturity_date=format_datetime(holding.maturity_date),
+        maturity_value_cents=maturity_value_cents,
+        apy=apy
+    )
+
+
+async def stream_holdings_ndjson(db: AsyncSession, query, request_id: Optional[str]):
+    """Yield holdings as NDJSON lines while rows arrive from a server-side cursor"""
+    result = await db.stream(query.execution_options(yield_per=500))
+    async for holding in result:
+        # One row at a time, so call the scalar calculator directly (same error handling as calculate_many)
+        try:
+            maturity_value_cents, apy = YieldCalculator.calculate_yield_from_rate(
+                holding.quantity_held, holding.interest_rate_bps, holding.issued_at, holding.maturity_date
+            )
+        except (ValueError, TypeError, AttributeError):
+            maturity_value_cents, apy = None, None
+            logger.warning(f"Could not calculate yield for holding {holding.id}", extra={"request_id": request_id})
+        
+        response = build_holding_response(holding, maturity_value_cents, apy)
+        yield response.model_dump_json(by_alias=True) + "\n"
 
 
 @router.get("/offerings", response_model=OfferingsResponse)
@@ -58,6 +183,7 @@ async def get_offerings(
     request: Request,
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(100, ge=1, le=1000, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous response's nextCursor (replaces page)"),
     currency: Optional[str] = Query(None, description="Filter by currency (USD, USDC)"),
     min_rate_bps: Optional[int] = Query(None, alias="minRateBps", description="Minimum interest rate in basis points"),
     max_rate_bps: Optional[int] = Query(None, alias="maxRateBps", description="Maximum interest rate in basis points"),
@@ -66,22 +192,31 @@ async def get_offerings(
     """
     Get list of open note offerings available for investment.
     Only returns notes where offering_status = 'open'.
+    
+    Pass the returned nextCursor as cursor to page forward without OFFSET;
+    page/limit paging is kept for existing clients.
+    
+    Unlike /holdings?stream=true the page is not streamed: it is serialized
+    into one body so the bytes can be cached and served with an ETag, and
+    the limit bounds its size.
     """
     request_id = request.headers.get("X-Request-ID")
+    if_none_match = request.headers.get("If-None-Match")
     
-    if not db:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Database not available"
-        )
+    # A cached page is returned as-is: no queries, no yield/risk computation, no serialization
+    cache_key = request.url.query
+    cached = offerings_cache.get(cache_key)
+    if cached is not None:
+        content, etag = cached
+        cache_headers = {"ETag": etag, "Cache-Control": OFFERINGS_CACHE_CONTROL}
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+        return Response(content=content, media_type="application/json", headers=cache_headers)
     
     try:
         # Build base query - only open offerings
-        query = select(NoteIssuance).where(
-            NoteIssuance.offering_status == OfferingStatusEnum.OPEN.value
-        )
-        count_query = select(func.count(NoteIssuance.id)).where(
-            NoteIssuance.offering_status == OfferingStatusEnum.OPEN.value
+        query = select(*_OFFERING_COLUMNS).where(
+            NoteIssuance.offering_status == _OFFERING_OPEN
         )
         
         # Apply filters
@@ -98,56 +233,90 @@ async def get_offerings(
         
         if conditions:
             query = query.where(and_(*conditions))
-            count_query = count_query.where(and_(*conditions))
         
-        # Get total count
-        total_result = await db.execute(count_query)
-        total = total_result.scalar() or 0
+        # Fingerprint the filtered open set (count, newest issue, id and protection checksums) for the ETag;
+        # a client holding the current ETag gets a 304 without the page query running. The count
+        # doubles as the response total, so the page query needs no count of its own
+        fingerprint_result = await db.execute(
+            select(
+                func.count(NoteIssuance.id),
+                func.max(NoteIssuance.issued_at),
+                func.coalesce(func.sum(NoteIssuance.id), 0),
+                func.coalesce(func.sum(
+                    NoteIssuance.collateral_coverage_cents
+                    + NoteIssuance.guarantee_coverage_cents
+                    + NoteIssuance.insurance_pool_cents
+                ), 0)
+            ).where(
+                NoteIssuance.offering_status == _OFFERING_OPEN,
+                *conditions
+            )
+        )
+        open_count, latest_issued_at, id_checksum, protection_checksum = fingerprint_result.one()
+        etag_source = f"{open_count}:{latest_issued_at}:{id_checksum}:{protection_checksum}:{request.url.query}"
+        etag = '"' + hashlib.sha1(etag_source.encode()).hexdigest() + '"'
+        cache_headers = {"ETag": etag, "Cache-Control": OFFERINGS_CACHE_CONTROL}
+        
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
         
-        # Apply sorting (newest first)
-        query = query.order_by(desc(NoteIssuance.issued_at))
+        # Apply sorting (newest first; id breaks ties so cursors are stable)
+        query = query.order_by(desc(NoteIssuance.issued_at), desc(NoteIssuance.id))
         
         # Apply pagination
-        offset = (page - 1) * limit
-        query = query.offset(offset).limit(limit)
+        if cursor:
+            # Keyset: seek past the previous page's last row instead of scanning an offset
+            cursor_issued_at, cursor_id = decode_offering_cursor(cursor)
+            query = query.where(
+                tuple_(NoteIssuance.issued_at, NoteIssuance.id) < tuple_(cursor_issued_at, cursor_id)
+            )
+        else:
+            query = query.offset((page - 1) * limit)
+        # One extra row tells whether another page follows, without counting past the limit
+        query = query.limit(limit + 1)
         
         # Execute query
         result = await db.execute(query)
-        notes = result.scalars().all()
+        rows = result.all()
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        total = open_count
+        
+        # Rows expose the projected columns by name, like the entity would
+        notes = rows
+        
+        # Calculate maturity values and APYs for the whole page at once
+        maturity_values, apys = YieldCalculator.calculate_many(
+            [note.amount for note in notes],
+            [note.interest_rate_bps for note in notes],
+            [note.issued_at for note in notes],
+            [note.maturity_date for note in notes]
+        )
         
         # Format results with yield calculations and protection summary
+        # (trusted, typed DB values - constructed without re-validation)
         formatted_offerings = []
-        for note in notes:
-            # Calculate maturity value and APY
-            maturity_value_cents = None
-            apy = None
+        for note, maturity_value_cents, apy in zip(notes, maturity_values, apys):
+            if maturity_value_cents is None:
+                logger.warning(f"Could not calculate yield for note {note.id}", extra={"request_id": request_id})
             
-            try:
-                maturity_value_cents, apy = YieldCalculator.calculate_yield_from_rate(
-                    principal_cents=note.amount,
-                    interest_rate_bps=note.interest_rate_bps,
-                    issued_date=note.issued_at,
-                    maturity_date=note.maturity_date
-                )
-            except Exception as e:
-                logger.warning(f"Error calculating yield for note {note.id}: {e}", extra={"request_id": request_id})
-            
-            # Calculate protection summary using RiskEngine
-            protection_summary = None
-            try:
-                risk_data = await RiskEngine.calculate_protection_waterfall(note.id, db)
-                protection_summary = risk_data.get("protection_summary")
-            except Exception as e:
-                logger.warning(f"Error calculating protection for note {note.id}: {e}", extra={"request_id": request_id})
+            # Protection layer totals come with the row, so the waterfall needs no queries
+            protection_summary = RiskEngine.build_waterfall(
+                note.amount,
+                note.collateral_coverage_cents,
+                note.guarantee_coverage_cents,
+                note.insurance_pool_cents
+            )["protection_summary"]
             
-            formatted_offerings.append(OfferingResponse(
+            formatted_offerings.append(OfferingResponse.model_construct(
                 id=note.id,
                 isin=note.isin,
                 wallet_address=note.wallet_address,
                 amount=note.amount,
                 maturity_date=format_datetime(note.maturity_date),
                 interest_rate_bps=note.interest_rate_bps,
-                currency=note.currency.value,
+                currency=note.currency,
                 min_subscription_amount=note.min_subscription_amount,
                 offering_status=note.offering_status,
                 issued_at=format_datetime(note.issued_at),
@@ -156,12 +325,20 @@ async def get_offerings(
                 protection_summary=protection_summary
             ))
         
-        return OfferingsResponse(
+        response = OfferingsResponse.model_construct(
             offerings=formatted_offerings,
             total=total,
             page=page,
             limit=limit,
-            has_more=(offset + limit) < total
+            has_more=has_more,
+            next_cursor=encode_offering_cursor(notes[-1]) if has_more and notes else None
+        )
+        content = response.model_dump_json(by_alias=True)
+        offerings_cache.set(cache_key, (content, etag))
+        return Response(
+            content=content,
+            media_type="application/json",
+            headers=cache_headers
         )
     except HTTPException:
         raise
@@ -194,12 +371,6 @@ async def create_order(
     """
     request_id = request.headers.get("X-Request-ID")
     
-    if not db:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Database not available"
-        )
-    
     # Get investor wallet from request (could be from auth token in production)
     # For now, we'll need to add it to the request body or header
     # Assuming it's in a custom header for MVP
@@ -213,46 +384,76 @@ async def create_order(
     investor_wallet = investor_wallet.lower()
     
     # Validate side
-    if order_data.side not in ['buy', 'sell']:
+    if order_data.side not in (_SIDE_BUY, _SIDE_SELL):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Order side must be 'buy' or 'sell'"
         )
     
     try:
-        # Validate note exists
-        note_result = await db.execute(
-            select(NoteIssuance).where(NoteIssuance.id == order_data.note_id)
-        )
-        note = note_result.scalar_one_or_none()
+        note_fields = note_cache.get(order_data.note_id)
+        wallet_fields = wallet_cache.get(investor_wallet)
         
-        if not note:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Note with ID {order_data.note_id} not found"
+        # Sell orders always need the wallet's current holdings; buy orders only hit the
+        # database when the note or wallet is not cached
+        if order_data.side == _SIDE_SELL or note_fields is None or wallet_fields is None:
+            # Fetch note and investor wallet in one round trip (wallet columns are NULL if unknown);
+            # sell orders also get the wallet's holdings of the note as a scalar subquery
+            lookup_columns = [
+                NoteIssuance.offering_status,
+                NoteIssuance.min_subscription_amount,
+                WalletVerification.is_verified,
+                WalletVerification.investor_tier,
+                WalletVerification.jurisdiction
+            ]
+            if order_data.side == _SIDE_SELL:
+                lookup_columns.append(
+                    select(func.coalesce(func.sum(InvestorHolding.quantity_held), 0))
+                    .where(
+                        InvestorHolding.wallet_address == investor_wallet,
+                        InvestorHolding.note_id == order_data.note_id
+                    )
+                    .scalar_subquery()
+                    .label("total_holdings")
+                )
+            lookup_result = await db.execute(
+                select(*lookup_columns)
+                .outerjoin(
+                    WalletVerification,
+                    WalletVerification.wallet_address == investor_wallet
+                )
+                .where(NoteIssuance.id == order_data.note_id)
             )
+            lookup = lookup_result.first()
+            
+            # Validate note exists
+            if not lookup:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Note with ID {order_data.note_id} not found"
+                )
+            
+            note_fields = (lookup.offering_status, lookup.min_subscription_amount)
+            wallet_fields = (bool(lookup.is_verified), lookup.investor_tier, lookup.jurisdiction)
+            note_cache.set(order_data.note_id, note_fields)
+            wallet_cache.set(investor_wallet, wallet_fields)
         
-        # Validate investor wallet
-        wallet_result = await db.execute(
-            select(WalletVerification).where(
-                WalletVerification.wallet_address == investor_wallet
-            )
-        )
-        wallet = wallet_result.scalar_one_or_none()
+        offering_status, min_subscription_amount = note_fields
+        is_verified, investor_tier, jurisdiction = wallet_fields
         
-        if order_data.side == 'buy':
+        if order_data.side == _SIDE_BUY:
             # Buy order validations
-            if not wallet or not wallet.is_verified:
+            if not is_verified:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Investor wallet must be verified (KYC'd) to place buy orders"
                 )
             
             # Validate compliance eligibility
-            if wallet.investor_tier and wallet.jurisdiction:
+            if investor_tier and jurisdiction:
                 is_eligible = validate_investment_eligibility(
-                    wallet_tier=wallet.investor_tier,
-                    wallet_jurisdiction=wallet.jurisdiction
+                    wallet_tier=investor_tier,
+                    wallet_jurisdiction=jurisdiction
                 )
                 if not is_eligible:
                     raise HTTPException(
@@ -261,31 +462,27 @@ async def create_order(
                     )
             
             # For primary market buy orders, validate offering is open
-            if note.offering_status == OfferingStatusEnum.OPEN.value:
+            if offering_status == _OFFERING_OPEN:
+                # One division answers both checks: at least one unit, and whole units only
+                subscription_units, subscription_remainder = divmod(order_data.amount, min_subscription_amount)
+                
                 # Validate amount meets minimum subscription
-                if order_data.amount < note.min_subscription_amount:
+                if subscription_units < 1:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Investment amount must be at least {note.min_subscription_amount} cents (${note.min_subscription_amount / 100:.2f})"
+                        detail=f"Investment amount must be at least {min_subscription_amount} cents (${min_subscription_amount / 100:.2f})"
                     )
                 
                 # Validate amount is multiple of min_subscription_amount
-                if order_data.amount % note.min_subscription_amount != 0:
+                if subscription_remainder != 0:
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Investment amount must be a multiple of {note.min_subscription_amount} cents"
+                        detail=f"Investment amount must be a multiple of {min_subscription_amount} cents"
                     )
         
-        elif order_data.side == 'sell':
-            # Sell order validations - check sufficient holdings
-            holdings_result = await db.execute(
-                select(func.sum(InvestorHolding.quantity_held))
-                .where(
-                    InvestorHolding.wallet_address == investor_wallet,
-                    InvestorHolding.note_id == order_data.note_id
-                )
-            )
-            total_holdings = holdings_result.scalar() or 0
+        elif order_data.side == _SIDE_SELL:
+            # Sell order validations - check sufficient holdings (loaded with the note)
+            total_holdings = lookup.total_holdings
             
             if total_holdings < order_data.amount:
                 raise HTTPException(
@@ -293,37 +490,36 @@ async def create_order(
                     detail=f"Insufficient holdings. Available: {total_holdings} cents, Requested: {order_data.amount} cents"
                 )
         
-        # Create order
-        order = Order(
-            investor_wallet=investor_wallet,
-            note_id=order_data.note_id,
-            amount=order_data.amount,
-            side=order_data.side,
-            price=order_data.price,
-            status=OrderStatusEnum.PENDING.value,
-            request_id=request_id
-        )
+        # Validation is done; end its read transaction so the connection isn't held while queued
+        await db.rollback()
         
-        db.add(order)
-        await db.commit()
-        await db.refresh(order)
+        # Create order - batched with concurrent orders for this note into one INSERT
+        order_id, created_at = await order_writer.submit({
+            "investor_wallet": investor_wallet,
+            "note_id": order_data.note_id,
+            "amount": order_data.amount,
+            "side": order_data.side,
+            "price": order_data.price,
+            "status": _ORDER_PENDING,
+            "request_id": request_id
+        })
         
         logger.info(
-            f"Order created: Order ID {order.id}, Side {order.side}, Note {order_data.note_id}, Amount {order_data.amount} cents",
-            extra={"request_id": request_id, "order_id": order.id, "note_id": order_data.note_id, "side": order.side}
+            f"Order created: Order ID {order_id}, Side {order_data.side}, Note {order_data.note_id}, Amount {order_data.amount} cents",
+            extra={"request_id": request_id, "order_id": order_id, "note_id": order_data.note_id, "side": order_data.side}
         )
         
         return OrderResponse(
-            id=order.id,
-            investor_wallet=order.investor_wallet,
-            note_id=order.note_id,
-            amount=order.amount,
-            side=order.side,
-            price=order.price,
-            status=order.status,
-            created_at=format_datetime(order.created_at),
-            filled_at=format_datetime(order.filled_at) if order.filled_at else None,
-            request_id=order.request_id
+            id=order_id,
+            investor_wallet=investor_wallet,
+            note_id=order_data.note_id,
+            amount=order_data.amount,
+            side=order_data.side,
+            price=order_data.price,
+            status=_ORDER_PENDING,
+            created_at=format_datetime(created_at),
+            filled_at=None,
+            request_id=request_id
         )
     except HTTPException:
         await db.rollback()
@@ -383,85 +579,96 @@ async def settle_note(
     """
     request_id = request.headers.get("X-Request-ID")
     
-    if not db:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Database not available"
-        )
-    
     try:
-        # Get note
-        note_result = await db.execute(
-            select(NoteIssuance).where(NoteIssuance.id == note_id)
-        )
-        note = note_result.scalar_one_or_none()
-        
-        if not note:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Note with ID {note_id} not found"
-            )
-        
-        if note.offering_status == OfferingStatusEnum.SETTLED.value:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Note is already settled"
+        # One transaction: commits on success, rolls back on any exception
+        async with db.begin():
+            # Get note, locked so concurrent settlements of it serialize
+            note_result = await db.execute(
+                select(NoteIssuance).where(NoteIssuance.id == note_id).with_for_update()
             )
-        
-        # Get all pending orders for this note
-        orders_result = await db.execute(
-            select(Order).where(
-                and_(
-                    Order.note_id == note_id,
-                    Order.status == OrderStatusEnum.PENDING.value
+            note = note_result.scalar_one_or_none()
+            
+            if not note:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Note with ID {note_id} not found"
+                )
+            
+            if note.offering_status == _OFFERING_SETTLED:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Note is already settled"
                 )
+            
+            pending_filter = and_(
+                Order.note_id == note_id,
+                Order.status == _ORDER_PENDING
             )
-        )
-        pending_orders = orders_result.scalars().all()
-        
-        # Calculate total subscribed amount
-        total_subscribed = sum(order.amount for order in pending_orders)
-        
-        # Check if fully subscribed
-        if total_subscribed < note.amount:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Note is not fully subscribed. Total subscribed: {total_subscribed} cents, Required: {note.amount} cents"
+            
+            # Calculate total subscribed amount server-side
+            total_result = await db.execute(
+                select(func.coalesce(func.sum(Order.amount), 0)).where(pending_filter)
             )
-        
-        # If over-subscribed, we'll fill proportionally (simple approach: fill all orders)
-        # In production, you might want more sophisticated allocation logic
-        
-        # Create holdings and update orders
-        holdings_created = 0
-        orders_filled = 0
-        filled_at = datetime.now(timezone.utc)
-        
-        for order in pending_orders:
+            total_subscribed = total_result.scalar()
+            
+            # Check if fully subscribed
+            if total_subscribed < note.amount:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Note is not fully subscribed. Total subscribed: {total_subscribed} cents, Required: {note.amount} cents"
+                )
+            
+            # Only the columns needed for holdings are fetched (plain rows, no ORM objects),
+            # locked until commit so no other request can fill or cancel them meanwhile
+            orders_result = await db.execute(
+                select(Order.id, Order.investor_wallet, Order.amount)
+                .where(pending_filter)
+                .with_for_update()
+            )
+            pending_orders = orders_result.all()
+            
+            # If over-subscribed, we'll fill proportionally (simple approach: fill all orders)
+            # In production, you might want more sophisticated allocation logic
+            
+            # Create holdings, then mark the orders filled
+            filled_at = datetime.now(timezone.utc)
+            
             # Calculate acquisition price (typically par value = 10000 cents per $100 unit)
             # For simplicity, we'll use 10000 cents per unit
             # In production, this might be calculated based on market conditions
             acquisition_price = 10000  # $100.00 per unit
             
-            # Create holding
-            holding = InvestorHolding(
-                wallet_address=order.investor_wallet,
-                note_id=note.id,
-                quantity_held=order.amount,
-                acquisition_price=acquisition_price
+            # One executemany INSERT for all holdings instead of an ORM add per order
+            holding_rows = [
+                {
+                    "wallet_address": order.investor_wallet,
+                    "note_id": note.id,
+                    "quantity_held": order.amount,
+                    "acquisition_price": acquisition_price
+                }
+                for order in pending_orders
+            ]
+            if holding_rows:
+                await db.execute(insert(InvestorHolding), holding_rows)
+            holdings_created = len(holding_rows)
+            
+            # Fill the settled orders in one statement (only those holdings were created for)
+            fill_result = await db.execute(
+                update(Order)
+                .where(
+                    Order.id.in_([order.id for order in pending_orders]),
+                    Order.status == _ORDER_PENDING
+                )
+                .values(status=_ORDER_FILLED, filled_at=filled_at)
             )
-            db.add(holding)
-            holdings_created += 1
+            orders_filled = fill_result.rowcount
             
-            # Update order status
-            order.status = OrderStatusEnum.FILLED.value
-            order.filled_at = filled_at
-            orders_filled += 1
+            # Update note status to settled
+            note.offering_status = _OFFERING_SETTLED
         
-        # Update note status to settled
-        note.offering_status = OfferingStatusEnum.SETTLED.value
-        
-        await db.commit()
+        # The settled note drops out of the open offerings
+        offerings_cache.clear()
+        note_cache.invalidate(note_id)
         
         logger.info(
             f"Note {note_id} settled: {orders_filled} orders filled, {holdings_created} holdings created",
@@ -479,16 +686,8 @@ async def settle_note(
             request_id=request_id
         )
     except HTTPException:
-        try:
-            await db.rollback()
-        except Exception as rollback_error:
-            logger.error(f"Error during rollback: {rollback_error}", extra={"request_id": request_id}, exc_info=True)
         raise
     except Exception as e:
-        try:
-            await db.rollback()
-        except Exception as rollback_error:
-            logger.error(f"Error during rollback: {rollback_error}", extra={"request_id": request_id}, exc_info=True)
         logger.error(f"Error settling note: {e}", extra={"request_id": request_id}, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -501,22 +700,20 @@ async def get_holdings(
     request: Request,
     wallet_address: Optional[str] = Query(None, alias="walletAddress", description="Filter by wallet address"),
     note_id: Optional[int] = Query(None, alias="noteId", description="Filter by note ID"),
+    stream: bool = Query(False, description="Stream holdings as NDJSON (one JSON object per line)"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Get investor holdings with yield calculations.
+    
+    With stream=true the holdings are sent as application/x-ndjson while they
+    are read from the database, instead of as one JSON array.
     """
     request_id = request.headers.get("X-Request-ID")
     
-    if not db:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Database not available"
-        )
-    
     try:
-        # Build query
-        query = select(InvestorHolding, NoteIssuance).join(
+        # Build query - one projection over the holding/note join, no ORM entities
+        query = select(*_HOLDING_COLUMNS).join(
             NoteIssuance, InvestorHolding.note_id == NoteIssuance.id
         )
         
@@ -531,41 +728,33 @@ async def get_holdings(
         if conditions:
             query = query.where(and_(*conditions))
         
+        if stream:
+            return StreamingResponse(
+                stream_holdings_ndjson(db, query, request_id),
+                media_type="application/x-ndjson"
+            )
+        
         # Execute query
         result = await db.execute(query)
         rows = result.all()
         
+        # Calculate maturity values and APYs for all holdings at once
+        maturity_values, apys = YieldCalculator.calculate_many(
+            [holding.quantity_held for holding in rows],
+            [holding.interest_rate_bps for holding in rows],
+            [holding.issued_at for holding in rows],
+            [holding.maturity_date for holding in rows]
+        )
+        
         # Format results
         holdings = []
-        for holding, note in rows:
-            # Calculate maturity value and APY
-            maturity_value_cents = None
-            apy = None
+        for holding, maturity_value_cents, apy in zip(rows, maturity_values, apys):
+            if maturity_value_cents is None:
+                logger.warning(f"Could not calculate yield for holding {holding.id}", extra={"request_id": request_id})
             
-            try:
-                maturity_value_cents, apy = YieldCalculator.calculate_yield_from_rate(
-                    principal_cents=holding.quantity_held,
-                    interest_rate_bps=note.interest_rate_bps,
-                    issued_date=note.issued_at,
-                    maturity_date=note.maturity_date
-                )
-            except Exception as e:
-                logger.warning(f"Error calculating yield for holding {holding.id}: {e}", extra={"request_id": request_id})
-            
-            holdings.append(HoldingResponse(
-                id=holding.id,
-                wallet_address=holding.wallet_address,
-                note_id=holding.note_id,
-                isin=note.isin,
-                quantity_held=holding.quantity_held,
-                acquisition_price=holding.acquisition_price,
-                acquired_at=format_datetime(holding.acquired_at),
-                maturity_date=format_datetime(note.maturity_date),
-                maturity_value_cents=maturity_value_cents,
-                apy=apy
-            ))
+            holdings.append(build_holding_response(holding, maturity_value_cents, apy))
         
-        return holdings
+        return Response(content=_HOLDINGS_ADAPTER.dump_json(holdings, by_alias=True), media_type="application/json")
     except Exception as e:
         logger.error(f"Error retrieving holdings: {e}", extra={"request_id": request_id}, exc_info=True)
         raise HTTPException(
@@ -592,12 +781,6 @@ async def get_risk_breakdown(
     """
     request_id = request.headers.get("X-Request-ID")
     
-    if not db:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Database not available"
-        )
-    
     try:
         # Calculate protection waterfall using RiskEngine
         risk_data = await RiskEngine.calculate_protection_waterfall(note_id, db)
@@ -624,13 +807,73 @@ async def get_risk_breakdown(
         )
 
 
-async def match_orders(note_id: int, db: AsyncSession) -> List[Trade]:
+def find_clearing_price(buy_orders: List[Order], sell_orders: List[Order]) -> Optional[int]:
+    """
+    Find the uniform clearing price of a call auction over the pending book.
+    
+    Demand at price p is every market bid plus limit bids priced >= p; supply is
+    every market ask plus limit asks priced <= p. The clearing price is the limit
+    price that maximizes executable volume min(demand, supply), then minimizes the
+    demand/supply imbalance, then is the lowest such price. One ascending sweep over
+    the distinct price levels after bucketing, so O(n) plus sorting the levels.
+    
+    Args:
+        buy_orders: Pending buy orders
+        sell_orders: Pending sell orders
+    
+    Returns:
+        Clearing price in cents, or None if no volume can execute
+    """
+    market_demand = 0
+    bid_volume: Dict[int, int] = defaultdict(int)
+    for order in buy_orders:
+        if order.price is None:
+            market_demand += order.amount
+        else:
+            bid_volume[order.price] += order.amount
+    
+    market_supply = 0
+    ask_volume: Dict[int, int] = defaultdict(int)
+    for order in sell_orders:
+        if order.price is None:
+            market_supply += order.amount
+        else:
+            ask_volume[order.price] += order.amount
+    
+    price_levels = sorted(bid_volume.keys() | ask_volume.keys())
+    if not price_levels:
+        # Only market orders on the book: they clear at the default price
+        return _DEFAULT_TRADE_PRICE if market_demand and market_supply else None
+    
+    demand = market_demand + sum(bid_volume.values())
+    supply = market_supply
+    clearing_price = None
+    best_volume = 0
+    best_imbalance = 0
+    for price in price_levels:
+        supply += ask_volume.get(price, 0)
+        volume = min(demand, supply)
+        imbalance = abs(demand - supply)
+        if volume > best_volume or (volume == best_volume and volume and imbalance < best_imbalance):
+            clearing_price, best_volume, best_imbalance = price, volume, imbalance
+        # Bids at this level do not buy at any higher price
+        demand -= bid_volume.get(price, 0)
+    
+    return clearing_price
+
+
+async def match_orders(
+    note_id: int,
+    db: AsyncSession,
+    mode: str = MATCH_MODE_CONTINUOUS
+) -> List[Dict]:
     """
     Match buy and sell orders for a note.
     
     Matching Logic:
-    - Fetches all pending orders for the note
+    - Fetches all pending orders for the note, each side in price-time priority
     - Matches Buy orders with Sell orders where buy_price >= sell_price
+      (uniform_price mode: every crossing order trades at one clearing price)
     - Creates trade records
     - Updates investor_holdings (decrement seller, increment buyer)
     - Updates order statuses to 'filled'
@@ -638,171 +881,311 @@ async def match_orders(note_id: int, db: AsyncSession) -> List[Trade]:
     Args:
         note_id: ID of the note to match orders for
         db: Database session
+        mode: MATCH_MODE_CONTINUOUS or MATCH_MODE_UNIFORM_PRICE
     
     Returns:
-        List of executed trades
+        List of executed trades as column dicts (including the assigned id)
     """
-    # Fetch all pending orders for this note
-    orders_result = await db.execute(
-        select(Order).where(
-            and_(
-                Order.note_id == note_id,
-                Order.status == OrderStatusEnum.PENDING.value
-            )
-        ).order_by(Order.created_at.asc())
+    # Fetch each side's pending orders, locked until the caller commits so a
+    # concurrent match or settlement cannot fill the same orders; orders already locked by
+    # another matcher are skipped rather than waited on, so matchers work disjoint slices
+    # of the book instead of serializing. The database sorts
+    # each side into price-time priority: bids highest first, asks lowest first, with
+    # market orders (no price) ahead of limit orders and ties broken by arrival
+    pending_filter = and_(
+        Order.note_id == note_id,
+        Order.status == _ORDER_PENDING
+    )
+    buys_result = await db.execute(
+        select(Order)
+        .where(pending_filter, Order.side == _SIDE_BUY)
+        .order_by(Order.price.desc().nulls_first(), Order.created_at.asc())
+        .with_for_update(skip_locked=True)
+    )
+    buy_orders = buys_result.scalars().all()
+    
+    sells_result = await db.execute(
+        select(Order)
+        .where(pending_filter, Order.side == _SIDE_SELL)
+        .order_by(Order.price.asc().nulls_first(), Order.created_at.asc())
+        .with_for_update(skip_locked=True)
+    )
+    sell_orders = sells_result.scalars().all()
+    
+    # A call auction fixes one price for all trades up front
+    clearing_price = None
+    if mode == MATCH_MODE_UNIFORM_PRICE:
+        clearing_price = find_clearing_price(buy_orders, sell_orders)
+        if clearing_price is None:
+            return []
+    
+    # Load every holding of this note once (locked, they are decremented/incremented below);
+    # per wallet, oldest first (FIFO decrement order). Holdings are kept as plain dicts and
+    # written back in bulk after matching rather than flushed one ORM object at a time
+    holdings_by_wallet: Dict[str, List[Dict]] = defaultdict(list)
+    holdings_result = await db.execute(
+        select(InvestorHolding.id, InvestorHolding.wallet_address, InvestorHolding.quantity_held)
+        .where(InvestorHolding.note_id == note_id)
+        .order_by(InvestorHolding.acquired_at.asc())
+        .with_for_update()
     )
-    all_orders = orders_result.scalars().all()
+    for holding in holdings_result.all():
+        holdings_by_wallet[holding.wallet_address].append(
+            {"id": holding.id, "quantity_held": holding.quantity_held}
+        )
+    
+    # Existing holdings whose quantity changed (by id) and holdings created by this run
+    changed_holdings: Dict[int, Dict] = {}
+    new_holdings: List[Dict] = []
     
-    # Separate buy and sell orders
-    buy_orders = [o for o in all_orders if o.side == OrderSideEnum.BUY.value]
-    sell_orders = [o for o in all_orders if o.side == OrderSideEnum.SELL.value]
+    # Quantity already traded per sell order in this run
+    sell_filled: Dict[int, int] = defaultdict(int)
     
     executed_trades = []
     filled_at = datetime.now(timezone.utc)
     
-    # Match orders: buy_price >= sell_price
+    # Match orders: buy_price >= sell_price. Both sides are in priority order, so each
+    # buy takes asks from the front of the book; asks before sell_index are fully filled
+    sell_index = 0
     for buy_order in buy_orders:
-        if buy_order.status != OrderStatusEnum.PENDING.value:
-            continue
-        
-        # Find matching sell orders
-        # If buy_order has a price, match with sell orders where sell_price <= buy_price
-        # If buy_order has no price (market order), match with any sell order
-        matching_sells = []
-        for sell_order in sell_orders:
-            if sell_order.status != OrderStatusEnum.PENDING.value:
-                continue
-            
-            # Price matching logic
-            if buy_order.price is not None and sell_order.price is not None:
-                # Both are limit orders - match if buy_price >= sell_price
-                if buy_order.price >= sell_order.price:
-                    matching_sells.append(sell_order)
-            elif buy_order.price is None:
-                # Market buy order - match with any sell order
-                matching_sells.append(sell_order)
-            elif sell_order.price is None:
-                # Market sell order - match with any buy order
-                matching_sells.append(sell_order)
-        
-        # Sort matching sells by price (lowest first) and creation time
-        matching_sells.sort(key=lambda x: (x.price if x.price is not None else 0, x.created_at))
+        if sell_index >= len(sell_orders):
+            break
+        
+        # Read the buy order's attributes once (instrumented attribute access is slow in the loop)
+        buy_id = buy_order.id
+        buy_price = buy_order.price
+        buy_wallet = buy_order.investor_wallet
+        
+        # A limit buy only crosses asks priced at or below it (market asks always cross).
+        # Bids are sorted highest first, so once the best ask does not cross, no later bid can
+        best_sell = sell_orders[sell_index]
+        if clearing_price is not None:
+            # Auction: only bids at or above the clearing price take part
+            if buy_price is not None and buy_price < clearing_price:
+                break
+        elif (
+            buy_price is not None
+            and best_sell.price is not None
+            and buy_price < best_sell.price
+        ):
+            break
         
         # Match buy order with sell orders
         remaining_buy_amount = buy_order.amount
         
-        for sell_order in matching_sells:
-            if remaining_buy_amount <= 0:
+        while remaining_buy_amount > 0 and sell_index < len(sell_orders):
+            sell_order = sell_orders[sell_index]
+            sell_id = sell_order.id
+            sell_price = sell_order.price
+            sell_amount = sell_order.amount
+            
+            # Price matching logic - stop at the first ask above a limit buy's price
+            # (in an auction, at the first ask above the clearing price)
+            if clearing_price is not None:
+                if sell_price is not None and sell_price > clearing_price:
+                    break
+            elif (
+                buy_price is not None
+                and sell_price is not None
+                and buy_price < sell_price
+            ):
                 break
             
             # Determine trade quantity (min of buy remaining and sell remaining)
-            sell_remaining = sell_order.amount - sum(
-                t.quantity for t in executed_trades 
-                if t.sell_order_id == sell_order.id
-            )
+            sell_remaining = sell_amount - sell_filled[sell_id]
             
             if sell_remaining <= 0:
+                sell_index += 1
                 continue
             
             trade_quantity = min(remaining_buy_amount, sell_remaining)
             
             # Determine trade price
-            # Use the sell order price if available, otherwise buy order price, otherwise market price
-            if sell_order.price is not None:
-                trade_price = sell_order.price
-            elif buy_order.price is not None:
-                trade_price = buy_order.price
+            # An auction trades everything at the clearing price; otherwise use the sell order
+            # price if available, otherwise buy order price, otherwise market price
+            if clearing_price is not None:
+                trade_price = clearing_price
+            elif sell_price is not None:
+                trade_price = sell_price
+            elif buy_price is not None:
+                trade_price = buy_price
             else:
                 # Both are market orders - use a default price (could be last trade price or note par value)
                 # For now, use 10000 cents ($100) as default
-                trade_price = 10000
-            
-            # Create trade record
-            trade = Trade(
-                buyer_wallet=buy_order.investor_wallet,
-                seller_wallet=sell_order.investor_wallet,
-                note_id=note_id,
-                quantity=trade_quantity,
-                price=trade_price,
-                buy_order_id=buy_order.id,
-                sell_order_id=sell_order.id,
-                timestamp=filled_at
-            )
-            db.add(trade)
-            executed_trades.append(trade)
+                trade_price = _DEFAULT_TRADE_PRICE
             
-            # Update holdings: decrement seller, increment buyer
-            # Find or create seller holding to decrement
-            seller_holding_result = await db.execute(
-                select(InvestorHolding).where(
-                    and_(
-                        InvestorHolding.wallet_address == sell_order.investor_wallet,
-                        InvestorHolding.note_id == note_id
-                    )
-                ).order_by(InvestorHolding.acquired_at.asc())
-            )
-            seller_holdings = seller_holding_result.scalars().all()
+            sell_wallet = sell_order.investor_wallet
+            
+            # Create trade record (inserted in bulk once matching is done)
+            executed_trades.append({
+                "buyer_wallet": buy_wallet,
+                "seller_wallet": sell_wallet,
+                "note_id": note_id,
+                "quantity": trade_quantity,
+                "price": trade_price,
+                "buy_order_id": buy_id,
+                "sell_order_id": sell_id,
+                "timestamp": filled_at
+            })
             
+            # Update holdings: decrement seller, increment buyer
             # Decrement from seller holdings (FIFO)
             remaining_to_decrement = trade_quantity
-            for holding in seller_holdings:
+            for holding in holdings_by_wallet[sell_wallet]:
                 if remaining_to_decrement <= 0:
                     break
-                if holding.quantity_held > 0:
-                    decrement_amount = min(remaining_to_decrement, holding.quantity_held)
-                    holding.quantity_held -= decrement_amount
+                if holding["quantity_held"] > 0:
+                    decrement_amount = min(remaining_to_decrement, holding["quantity_held"])
+                    holding["quantity_held"] -= decrement_amount
                     remaining_to_decrement -= decrement_amount
+                    if "id" in holding:
+                        changed_holdings[holding["id"]] = holding
             
             # Increment buyer holding
-            # Check if buyer already has a holding for this note
-            buyer_holding_result = await db.execute(
-                select(InvestorHolding).where(
-                    and_(
-                        InvestorHolding.wallet_address == buy_order.investor_wallet,
-                        InvestorHolding.note_id == note_id
-                    )
-                ).order_by(InvestorHolding.acquired_at.desc()).limit(1)
-            )
-            buyer_holding = buyer_holding_result.scalar_one_or_none()
+            # Add to the buyer's most recent holding for this note, if any
+            buyer_holdings = holdings_by_wallet[buy_wallet]
             
-            if buyer_holding:
+            if buyer_holdings:
                 # Add to existing holding
-                buyer_holding.quantity_held += trade_quantity
+                buyer_holding = buyer_holdings[-1]
+                buyer_holding["quantity_held"] += trade_quantity
+                if "id" in buyer_holding:
+                    changed_holdings[buyer_holding["id"]] = buyer_holding
             else:
                 # Create new holding
-                buyer_holding = InvestorHolding(
-                    wallet_address=buy_order.investor_wallet,
-                    note_id=note_id,
-                    quantity_held=trade_quantity,
-                    acquisition_price=trade_price
-                )
-                db.add(buyer_holding)
+                buyer_holding = {
+                    "wallet_address": buy_wallet,
+                    "note_id": note_id,
+                    "quantity_held": trade_quantity,
+                    "acquisition_price": trade_price
+                }
+                new_holdings.append(buyer_holding)
+                buyer_holdings.append(buyer_holding)
             
             # Update order statuses
             remaining_buy_amount -= trade_quantity
+            sell_filled[sell_id] += trade_quantity
             
             # Check if buy order is fully filled
             if remaining_buy_amount <= 0:
-                buy_order.status = OrderStatusEnum.FILLED.value
+                buy_order.status = _ORDER_FILLED
                 buy_order.filled_at = filled_at
             
             # Check if sell order is fully filled
-            sell_filled_quantity = sum(
-                t.quantity for t in executed_trades 
-                if t.sell_order_id == sell_order.id
-            ) + trade_quantity
-            
-            if sell_filled_quantity >= sell_order.amount:
-                sell_order.status = OrderStatusEnum.FILLED.value
+            if sell_filled[sell_id] >= sell_amount:
+                sell_order.status = _ORDER_FILLED
                 sell_order.filled_at = filled_at
+                sell_index += 1
+    
+    # Write holdings back: one executemany UPDATE by primary key, one INSERT for new holdings
+    if changed_holdings:
+        await db.execute(
+            update(InvestorHolding),
+            [
+                {"id": holding_id, "quantity_held": holding["quantity_held"]}
+                for holding_id, holding in changed_holdings.items()
+            ]
+        )
+    if new_holdings:
+        await db.execute(insert(InvestorHolding), new_holdings)
+    
+    # Insert every trade with one executemany INSERT ... RETURNING, ids in parameter order
+    if executed_trades:
+        trade_ids = await db.execute(
+            insert(Trade).returning(Trade.id, sort_by_parameter_order=True),
+            executed_trades
+        )
+        for trade, trade_id in zip(executed_trades, trade_ids.scalars().all()):
+            trade["id"] = trade_id
     
     return executed_trades
 
 
-@router.post("/match/{note_id}", response_model=MatchResponse)
+def build_match_job_response(job) -> MatchJobResponse:
+    """Build the API representation of a match_jobs row"""
+    return MatchJobResponse(
+        job_id=job.id,
+        note_id=job.note_id,
+        mode=job.mode,
+        status=job.status,
+        trades_executed=job.trades_executed,
+        total_quantity=job.total_quantity,
+        clearing_price=job.clearing_price,
+        error=job.error,
+        created_at=format_datetime(job.created_at),
+        completed_at=format_datetime(job.completed_at) if job.completed_at else None,
+        request_id=job.request_id
+    )
+
+
+async def run_match_job(job_id: int, note_id: int, mode: str, request_id: Optional[str]) -> None:
+    """
+    Execute a queued match job in its own session, after the response was sent.
+    
+    The trades and the job's completed status commit in one transaction; on any
+    error both roll back and the job is marked failed.
+    """
+    async with database.async_session_maker() as session:
+        try:
+            await session.execute(
+                update(MatchJob).where(MatchJob.id == job_id).values(status=_JOB_RUNNING)
+            )
+            await session.commit()
+            
+            executed_trades = await match_orders(note_id, session, mode)
+            total_quantity = sum(trade["quantity"] for trade in executed_trades)
+            
+            await session.execute(
+                update(MatchJob)
+                .where(MatchJob.id == job_id)
+                .values(
+                    status=_JOB_COMPLETED,
+                    trades_executed=len(executed_trades),
+                    total_quantity=total_quantity,
+                    clearing_price=(
+                        executed_trades[0]["price"]
+                        if mode == MATCH_MODE_UNIFORM_PRICE and executed_trades else None
+                    ),
+                    completed_at=datetime.now(timezone.utc)
+                )
+            )
+            await session.commit()
+            
+            logger.info(
+                f"Match job {job_id} completed for note {note_id}: {len(executed_trades)} trades executed, {total_quantity} cents total",
+                extra={"request_id": request_id, "note_id": note_id, "trades_count": len(executed_trades)}
+            )
+        except Exception as e:
+            logger.error(f"Error running match job {job_id}: {e}", extra={"request_id": request_id}, exc_info=True)
+            try:
+                await session.rollback()
+                await session.execute(
+                    update(MatchJob)
+                    .where(MatchJob.id == job_id)
+                    .values(status=_JOB_FAILED, error=str(e), completed_at=datetime.now(timezone.utc))
+                )
+                await session.commit()
+            except Exception as status_error:
+                logger.error(f"Error recording failure of match job {job_id}: {status_error}", extra={"request_id": request_id}, exc_info=True)
+
+
+@router.post(
+    "/match/{note_id}",
+    response_model=MatchResponse,
+    responses={status.HTTP_202_ACCEPTED: {"model": MatchJobResponse, "description": "Match queued (background=true)"}}
+)
 async def match_orders_endpoint(
     request: Request,
+    background_tasks: BackgroundTasks,
     note_id: int = Path(..., description="Note ID to match orders for"),
+    mode: str = Query(
+        MATCH_MODE_CONTINUOUS,
+        description="Matching mode: continuous (price-time) or uniform_price (call auction at one clearing price)"
+    ),
+    background: bool = Query(
+        False,
+        description="Queue the match as a background job and return 202 with the job (poll GET /match/jobs/{jobId})"
+    ),
     db: AsyncSession = Depends(get_db),
     _admin_auth: bool = Depends(validate_admin_key)
 ):
@@ -814,58 +1197,92 @@ async def match_orders_endpoint(
     This endpoint:
     1. Fetches all pending orders for the note
     2. Matches Buy orders with Sell orders where buy_price >= sell_price
+       (mode=uniform_price: all crossing volume trades at a single clearing price)
     3. Creates trade records
     4. Updates investor_holdings (decrement seller, increment buyer)
     5. Updates order statuses to 'filled'
+    
+    With background=true the note is validated, a match job is recorded and the
+    matching runs after the 202 response is sent.
     """
     request_id = request.headers.get("X-Request-ID")
     
-    if not db:
+    if mode not in (MATCH_MODE_CONTINUOUS, MATCH_MODE_UNIFORM_PRICE):
         raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Database not available"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Match mode must be 'continuous' or 'uniform_price'"
         )
     
-    try:
-        # Validate note exists
-        note_result = await db.execute(
-            select(NoteIssuance).where(NoteIssuance.id == note_id)
-        )
-        note = note_result.scalar_one_or_none()
-        
-        if not note:
+    if background:
+        try:
+            note_result = await db.execute(
+                select(NoteIssuance.id).where(NoteIssuance.id == note_id)
+            )
+            if note_result.scalar_one_or_none() is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Note with ID {note_id} not found"
+                )
+            
+            job_result = await db.execute(
+                insert(MatchJob)
+                .values(note_id=note_id, mode=mode, status=_JOB_QUEUED, request_id=request_id)
+                .returning(MatchJob)
+            )
+            job = job_result.scalar_one()
+            await db.commit()
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error queueing match job: {e}", extra={"request_id": request_id}, exc_info=True)
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Note with ID {note_id} not found"
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to queue match job: {str(e)}"
             )
         
-        # Execute matching
-        executed_trades = await match_orders(note_id, db)
-        
-        # Commit all changes
-        await db.commit()
-        
-        # Refresh trades to get IDs
-        for trade in executed_trades:
-            await db.refresh(trade)
-        
-        # Format trade responses
-        trade_responses = [
-            TradeResponse(
-                id=trade.id,
-                buyer_wallet=trade.buyer_wallet,
-                seller_wallet=trade.seller_wallet,
-                note_id=trade.note_id,
-                quantity=trade.quantity,
-                price=trade.price,
-                buy_order_id=trade.buy_order_id,
-                sell_order_id=trade.sell_order_id,
-                timestamp=format_datetime(trade.timestamp)
+        background_tasks.add_task(run_match_job, job.id, note_id, mode, request_id)
+        return Response(
+            content=build_match_job_response(job).model_dump_json(by_alias=True),
+            status_code=status.HTTP_202_ACCEPTED,
+            media_type="application/json"
+        )
+    
+    try:
+        # One transaction: commits on success, rolls back on any exception
+        async with db.begin():
+            # Verify note exists (read inside the transaction rather than from the order
+            # cache, which can outlive a deleted note)
+            note_result = await db.execute(
+                select(NoteIssuance.id).where(NoteIssuance.id == note_id)
             )
-            for trade in executed_trades
-        ]
+            if note_result.scalar_one_or_none() is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Note with ID {note_id} not found"
+                )
+            
+            # Execute matching
+            executed_trades = await match_orders(note_id, db, mode)
         
-        total_quantity = sum(trade.quantity for trade in executed_trades)
+        # Format trade responses and total the quantity in one pass (ids were returned by the
+        # insert, no refresh needed; values are the typed rows just written, so validation is skipped)
+        trade_responses = []
+        total_quantity = 0
+        # Every trade of a match run carries the same fill timestamp, so it is formatted once
+        trade_timestamp = format_datetime(executed_trades[0]["timestamp"]) if executed_trades else None
+        for trade in executed_trades:
+            total_quantity += trade["quantity"]
+            trade_responses.append(TradeResponse.model_construct(
+                id=trade["id"],
+                buyer_wallet=trade["buyer_wallet"],
+                seller_wallet=trade["seller_wallet"],
+                note_id=trade["note_id"],
+                quantity=trade["quantity"],
+                price=trade["price"],
+                buy_order_id=trade["buy_order_id"],
+                sell_order_id=trade["sell_order_id"],
+                timestamp=trade_timestamp
+            ))
         
         logger.info(
             f"Order matching completed for note {note_id}: {len(executed_trades)} trades executed, {total_quantity} cents total",
@@ -879,21 +1296,52 @@ async def match_orders_endpoint(
             trades_executed=len(executed_trades),
             total_quantity=total_quantity,
             trades=trade_responses,
+            clearing_price=(
+                executed_trades[0]["price"]
+                if mode == MATCH_MODE_UNIFORM_PRICE and executed_trades else None
+            ),
             request_id=request_id
         )
     except HTTPException:
-        try:
-            await db.rollback()
-        except Exception as rollback_error:
-            logger.error(f"Error during rollback: {rollback_error}", extra={"request_id": request_id}, exc_info=True)
         raise
     except Exception as e:
-        try:
-            await db.rollback()
-        except Exception as rollback_error:
-            logger.error(f"Error during rollback: {rollback_error}", extra={"request_id": request_id}, exc_info=True)
         logger.error(f"Error matching orders: {e}", extra={"request_id": request_id}, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to match orders: {str(e)}"
         )
+
+
+@router.get("/match/jobs/{job_id}", response_model=MatchJobResponse)
+async def get_match_job(
+    request: Request,
+    job_id: int = Path(..., description="Match job ID returned by POST /match/{note_id}?background=true"),
+    db: AsyncSession = Depends(get_db),
+    _admin_auth: bool = Depends(validate_admin_key)
+):
+    """
+    Get the status and outcome of a background match job (Admin only).
+    """
+    request_id = request.headers.get("X-Request-ID")
+    
+    try:
+        job_result = await db.execute(
+            select(MatchJob).where(MatchJob.id == job_id)
+        )
+        job = job_result.scalar_one_or_none()
+        
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Match job with ID {job_id} not found"
+            )
+        
+        return build_match_job_response(job)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving match job {job_id}: {e}", extra={"request_id": request_id}, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve match job: {str(e)}"
+        )
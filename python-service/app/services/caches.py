@@ -0,0 +1,19 @@
+"""
+Shared Caches - Per-process TTL caches used by more than one router
+Routes that change the underlying data invalidate the entries here
+"""
+
+from app.utils.ttl_cache import TTLCache
+
+# Serialized offerings pages (body bytes + ETag) keyed by query string; cleared
+# when notes are issued or settled, the TTL covers changes made by other workers
+OFFERINGS_CACHE_TTL_SECONDS = 10.0
+offerings_cache = TTLCache(ttl_seconds=OFFERINGS_CACHE_TTL_SECONDS)
+
+# Fields create_order validates against, cached per process for a few seconds:
+# note_id -> (offering_status, min_subscription_amount) and
+# wallet -> (is_verified, investor_tier, jurisdiction), an unknown wallet as unverified.
+# Entries are dropped on settlement / KYC changes; the short TTL covers other workers
+ORDER_LOOKUP_CACHE_TTL_SECONDS = 5.0
+note_cache = TTLCache(ttl_seconds=ORDER_LOOKUP_CACHE_TTL_SECONDS, max_entries=10_000)
+wallet_cache = TTLCache(ttl_seconds=ORDER_LOOKUP_CACHE_TTL_SECONDS, max_entries=10_000)
@@ -0,0 +1,153 @@
+"""
+Order Writer Service - Coalesces concurrent order inserts per note
+Orders for the same note that arrive within a few milliseconds are written
+with one multi-row INSERT and one commit instead of a transaction each
+"""
+
+from typing import Dict, List, Tuple
+from datetime import datetime
+from sqlalchemy import insert
+import asyncio
+import logging
+
+from app import database
+from app.models.database import Order
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on orders written by one INSERT
+MAX_BATCH_SIZE = 500
+# How long a batch stays open for more orders once the first one arrives
+BATCH_WINDOW_SECONDS = 0.005
+# How long an idle note keeps its queue and writer task before they are dropped
+IDLE_TIMEOUT_SECONDS = 1.0
+
+
+class OrderWriter:
+    """Per-note batching writer for new orders"""
+    
+    def __init__(self):
+        self._queues: Dict[int, asyncio.Queue] = {}
+        self._tasks: Dict[int, asyncio.Task] = {}
+    
+    async def submit(self, values: dict) -> Tuple[int, datetime]:
+        """
+        Queue an order for insertion and wait until its batch is committed.
+        
+        Args:
+            values: Column values for the new order (must include note_id)
+        
+        Returns:
+            Tuple of (order_id, created_at) assigned by the database
+        """
+        note_id = values["note_id"]
+        queue = self._queues.get(note_id)
+        if queue is None:
+            queue = asyncio.Queue()
+            self._queues[note_id] = queue
+            self._tasks[note_id] = asyncio.create_task(self._drain(note_id, queue))
+        
+        future = asyncio.get_running_loop().create_future()
+        queue.put_nowait((values, future))
+        return await future
+    
+    async def _drain(self, note_id: int, queue: asyncio.Queue) -> None:
+        """Write queued orders for one note in batches until the note goes idle"""
+        while True:
+            try:
+                first = await asyncio.wait_for(queue.get(), timeout=IDLE_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                # No await between the emptiness check and removal, so submit() cannot race it
+                if queue.empty():
+                    del self._queues[note_id]
+                    del self._tasks[note_id]
+                    return
+                continue
+            
+            batch = [first]
+            try:
+                deadline = asyncio.get_running_loop().time() + BATCH_WINDOW_SECONDS
+                while len(batch) < MAX_BATCH_SIZE:
+                    remaining = deadline - asyncio.get_running_loop().time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+                    except asyncio.TimeoutError:
+                        break
+                
+                await self._write_batch(note_id, batch)
+            except asyncio.CancelledError:
+                # Shutdown: the batch is already off the queue, so close() cannot reach
+                # its futures; release their callers here instead of leaving them waiting
+                for _, future in batch:
+                    if not future.done():
+                        future.cancel()
+                raise
+    
+    async def _write_batch(self, note_id: int, batch: List[Tuple[dict, asyncio.Future]]) -> None:
+        """Insert one batch of orders and resolve each caller's future"""
+        # Orders whose caller went away (request cancelled while queued) are not written
+        batch = [(values, future) for values, future in batch if not future.done()]
+        if not batch:
+            return
+        
+        try:
+            async with database.async_session_maker() as session:
+                async with session.begin():
+                    result = await session.execute(
+                        insert(Order).returning(
+                            Order.id,
+                            Order.created_at,
+                            sort_by_parameter_order=True
+                        ),
+                        [values for values, _ in batch]
+                    )
+                    rows = result.all()
+        except Exception as e:
+            # One bad row fails the whole INSERT; write the orders one by one so each
+            # caller gets only its own result or error
+            logger.warning(f"Order batch for note {note_id} failed, retrying row by row: {e}")
+            for values, future in batch:
+                await self._write_one(note_id, values, future)
+            return
+        
+        for (_, future), row in zip(batch, rows):
+            if not future.done():
+                future.set_result((row.id, row.created_at))
+    
+    async def _write_one(self, note_id: int, values: dict, future: asyncio.Future) -> None:
+        """Insert a single order in its own transaction and resolve its future"""
+        if future.done():
+            return
+        
+        try:
+            async with database.async_session_maker() as session:
+                async with session.begin():
+                    result = await session.execute(
+                        insert(Order).values(**values).returning(Order.id, Order.created_at)
+                    )
+                    row = result.one()
+        except Exception as e:
+            logger.error(f"Error writing order for note {note_id}: {e}", exc_info=True)
+            if not future.done():
+                future.set_exception(e)
+            return
+        
+        if not future.done():
+            future.set_result((row.id, row.created_at))
+    
+    async def close(self) -> None:
+        """Cancel all writer tasks and any orders still waiting or in flight (called on shutdown)"""
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        for queue in self._queues.values():
+            while not queue.empty():
+                _, future = queue.get_nowait()
+                future.cancel()
+        self._queues.clear()
+        self._tasks.clear()
+
+
+order_writer = OrderWriter()
@@ -3,17 +3,12 @@ Risk Engine Service - Calculates protection waterfall for notes
 Implements the risk waterfall logic from the MicroPaper whitepaper
 """
 
-from typing import Dict, Optional
+from typing import Dict
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 import logging
 
-from app.models.database import (
-    NoteIssuance,
-    CollateralAsset,
-    Guarantee,
-    InsurancePoolContribution
-)
+from app.models.database import NoteIssuance
 
 logger = logging.getLogger(__name__)
 
@@ -49,57 +44,52 @@ class RiskEngine:
                 "protection_summary": str
             }
         """
-        # Fetch the note
+        # Fetch the note's face value and protection layer totals (maintained by triggers)
         note_result = await db.execute(
-            select(NoteIssuance).where(NoteIssuance.id == note_id)
+            select(
+                NoteIssuance.amount,
+                NoteIssuance.collateral_coverage_cents,
+                NoteIssuance.guarantee_coverage_cents,
+                NoteIssuance.insurance_pool_cents
+            ).where(NoteIssuance.id == note_id)
         )
-        note = note_result.scalar_one_or_none()
+        note = note_result.one_or_none()
         
         if not note:
             raise ValueError(f"Note with ID {note_id} not found")
         
-        face_value = note.amount
-        
-        # 1. Calculate Collateral Coverage
-        # Sum all active collateral assets
-        collateral_result = await db.execute(
-            select(func.sum(CollateralAsset.valuation_cents))
-            .where(
-                CollateralAsset.note_id == note_id,
-                CollateralAsset.status == 'active'
-            )
-        )
-        collateral_coverage = collateral_result.scalar() or 0
-        
-        # 2. Calculate Guarantee Coverage
-        # Sum coverage from all active guarantees
-        # Coverage = note_amount * coverage_percent / 100 for each guarantee
-        guarantees_result = await db.execute(
-            select(Guarantee)
-            .where(
-                Guarantee.note_id == note_id,
-                Guarantee.enforcement_status == 'active'
-            )
+        return RiskEngine.build_waterfall(
+            note.amount,
+            note.collateral_coverage_cents,
+            note.guarantee_coverage_cents,
+            note.insurance_pool_cents
         )
-        guarantees = guarantees_result.scalars().all()
+    
+    @staticmethod
+    def build_waterfall(
+        face_value: int,
+        collateral_coverage: int,
+        guarantee_coverage: int,
+        insurance_pool_claim: int
+    ) -> Dict:
+        """
+        Apply the waterfall to one note's protection layer totals.
         
-        guarantee_coverage = 0
-        for guarantee in guarantees:
-            # Calculate coverage amount: face_value * coverage_percent / 100
-            coverage_amount = int(face_value * guarantee.coverage_percent / 100)
-            guarantee_coverage += coverage_amount
+        Pure arithmetic, so list endpoints can call it per row on the totals
+        stored with the note (no queries).
         
+        Args:
+            face_value: Note amount in cents
+            collateral_coverage: Active collateral valuation in cents
+            guarantee_coverage: Sum of face_value * coverage_percent / 100 over active guarantees
+            insurance_pool_claim: Insurance pool contributions in cents
+            
+        Returns:
+            The breakdown described in calculate_protection_waterfall
+        """
         # Cap guarantee coverage at face_value (can't exceed 100%)
         guarantee_coverage = min(guarantee_coverage, face_value)
         
-        # 3. Calculate Insurance Pool Claim
-        # Sum all insurance pool contributions for this note
-        insurance_result = await db.execute(
-            select(func.sum(InsurancePoolContribution.amount_cents))
-            .where(InsurancePoolContribution.note_id == note_id)
-        )
-        insurance_pool_claim = insurance_result.scalar() or 0
-        
         # Calculate total protection (in waterfall order)
         # Note: In a default scenario, we use collateral first, then guarantees, then insurance
         # For visualization, we show all layers but calculate uncovered exposure
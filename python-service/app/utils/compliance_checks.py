@@ -4,6 +4,12 @@ Compliance validation utilities for investment eligibility checks
 
 from typing import Optional
 
+# (tier, jurisdiction) pairs barred from investing, in normalized case
+# SEC Rule: US retail investors are not eligible
+_BLOCKED = frozenset({
+    ("retail", "US"),
+})
+
 
 def validate_investment_eligibility(
     wallet_tier: Optional[str],
@@ -29,13 +35,5 @@ def validate_investment_eligibility(
     if not wallet_tier or not wallet_jurisdiction:
         return True
     
-    # Normalize inputs to uppercase for comparison
-    tier = wallet_tier.lower() if wallet_tier else None
-    jurisdiction = wallet_jurisdiction.upper() if wallet_jurisdiction else None
-    
-    # SEC Rule: US retail investors are not eligible
-    if jurisdiction == 'US' and tier == 'retail':
-        return False
-    
-    # All other combinations are eligible
-    return True
+    # Normalize case and look the pair up in the rule table; all other combinations are eligible
+    return (wallet_tier.lower(), wallet_jurisdiction.upper()) not in _BLOCKED
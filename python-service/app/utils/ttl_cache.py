@@ -0,0 +1,50 @@
+"""
+TTL Cache Utility
+Small in-process cache whose entries expire a fixed number of seconds after being set
+"""
+
+from typing import Any, Dict, Hashable, Optional, Tuple
+import time
+
+
+class TTLCache:
+    """
+    Dict-backed cache with per-entry expiry.
+    
+    Entries are dropped lazily on read; once max_entries is reached the oldest
+    entry is evicted. Not shared between worker processes, so the TTL bounds
+    how stale another worker's copy can be after clear().
+    """
+    
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self._entries.pop(key, None)
+            return None
+        return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache value under key for ttl_seconds"""
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_entries:
+            # Dicts keep insertion order, so the first key is the oldest entry
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+    
+    def invalidate(self, key: Hashable) -> None:
+        """Drop the entry for key, if any"""
+        self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Drop every entry (called when the cached data changes)"""
+        self._entries.clear()
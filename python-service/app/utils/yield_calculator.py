@@ -4,8 +4,15 @@ Calculates maturity value and APY for commercial paper notes using integer math
 """
 
 from datetime import datetime, timezone
-from typing import Tuple
-from decimal import Decimal, ROUND_DOWN
+from functools import lru_cache
+from typing import Tuple, List, Optional, Sequence
+
+# Day-count conventions and unit scales (yield math stays in exact integers)
+_BPS_PER_UNIT = 10000
+_DAYS_PER_YEAR_360 = 360
+_DAYS_PER_YEAR_365 = 365
+# Interest denominator: basis points per unit times the 360-day year
+_INTEREST_DIVISOR = _BPS_PER_UNIT * _DAYS_PER_YEAR_360
 
 
 class YieldCalculator:
@@ -41,19 +48,13 @@ class YieldCalculator:
         if days_to_maturity < 0:
             raise ValueError("Days to maturity cannot be negative")
         
-        # Convert basis points to decimal (500 bps = 0.05 = 5%)
-        rate_decimal = Decimal(interest_rate_bps) / Decimal(10000)
-        
-        # Calculate interest: Principal * Rate * (Days / 360)
-        # Using 360-day year convention (commercial paper standard)
-        days_decimal = Decimal(days_to_maturity) / Decimal(360)
-        interest_cents = Decimal(principal_cents) * rate_decimal * days_decimal
+        # Calculate interest: Principal * (Rate / 10000) * (Days / 360)
+        # Using 360-day year convention (commercial paper standard);
+        # one exact floor division rounds down to the nearest cent
+        interest_cents = (principal_cents * interest_rate_bps * days_to_maturity) // _INTEREST_DIVISOR
         
         # Maturity value = Principal + Interest
-        maturity_value = Decimal(principal_cents) + interest_cents
-        
-        # Round down to nearest cent (integer)
-        return int(maturity_value.quantize(Decimal('1'), rounding=ROUND_DOWN))
+        return principal_cents + interest_cents
     
     @staticmethod
     def calculate_apy(
@@ -79,19 +80,18 @@ class YieldCalculator:
         if days_to_maturity <= 0:
             return 0.0
         
-        # Calculate return ratio
-        return_ratio = Decimal(maturity_value_cents) / Decimal(principal_cents)
-        
-        # Calculate annualized return
-        # Using 365-day year for APY calculation
-        annualized_return = (return_ratio - Decimal('1')) * (Decimal('365') / Decimal(days_to_maturity))
-        
-        # Convert to percentage
-        apy_percentage = float(annualized_return * Decimal('100'))
+        # Annualized return as a percentage:
+        # (Maturity Value - Principal) / Principal * (365 / Days) * 100
+        # Using 365-day year for APY calculation; the integer numerator and
+        # denominator are exact, so the single division is the only rounding step
+        apy_percentage = (
+            (maturity_value_cents - principal_cents) * _DAYS_PER_YEAR_365 * 100
+        ) / (principal_cents * days_to_maturity)
         
         return round(apy_percentage, 2)
     
     @staticmethod
+    @lru_cache(maxsize=10_000)
     def calculate_yield_from_rate(
         principal_cents: int,
         interest_rate_bps: int,
@@ -101,6 +101,9 @@ class YieldCalculator:
         """
         Calculate maturity value and APY from interest rate and dates.
         
+        Results are memoized: the calculation is pure and list pages repeat
+        the same (principal, rate, issued, maturity) combinations.
+        
         Args:
             principal_cents: Principal amount in cents
             interest_rate_bps: Interest rate in basis points
@@ -139,6 +142,50 @@ class YieldCalculator:
         
         return maturity_value_cents, apy
     
+    @staticmethod
+    def calculate_many(
+        principals_cents: Sequence[int],
+        interest_rates_bps: Sequence[int],
+        issued_dates: Sequence[datetime],
+        maturity_dates: Sequence[datetime]
+    ) -> Tuple[List[Optional[int]], List[Optional[float]]]:
+        """
+        Calculate maturity values and APYs for a whole result page in one call.
+        
+        Rows whose inputs are invalid (negative rate, missing dates) get None
+        for both values instead of raising, so list endpoints need no per-row
+        exception handling.
+        
+        Args:
+            principals_cents: Principal amounts in cents
+            interest_rates_bps: Interest rates in basis points
+            issued_dates: Issue dates
+            maturity_dates: Maturity dates
+            
+        Returns:
+            Tuple of (maturity_values_cents, apy_percentages), aligned with the inputs
+        """
+        maturity_values: List[Optional[int]] = []
+        apys: List[Optional[float]] = []
+        
+        for principal_cents, interest_rate_bps, issued_date, maturity_date in zip(
+            principals_cents, interest_rates_bps, issued_dates, maturity_dates
+        ):
+            try:
+                maturity_value_cents, apy = YieldCalculator.calculate_yield_from_rate(
+                    principal_cents,
+                    interest_rate_bps,
+                    issued_date,
+                    maturity_date
+                )
+            except (ValueError, TypeError, AttributeError):
+                maturity_value_cents, apy = None, None
+            
+            maturity_values.append(maturity_value_cents)
+            apys.append(apy)
+        
+        return maturity_values, apys
+    
     @staticmethod
     def format_cents_to_dollars(cents: int) -> str:
         """
@@ -150,8 +197,10 @@ class YieldCalculator:
         Returns:
             Formatted string (e.g., "10000" -> "$100.00")
         """
-        dollars = Decimal(cents) / Decimal('100')
-        return f"${dollars:,.2f}"
+        # Split whole units and hundredths with integer divmod (same output as a 2dp Decimal)
+        sign = "-" if cents < 0 else ""
+        dollars, hundredths = divmod(abs(cents), 100)
+        return f"${sign}{dollars:,}.{hundredths:02d}"
     
     @staticmethod
     def format_bps_to_percentage(bps: int) -> str:
@@ -164,5 +213,6 @@ class YieldCalculator:
         Returns:
             Formatted string (e.g., 500 -> "5.00%")
         """
-        percentage = Decimal(bps) / Decimal('100')
-        return f"{percentage:.2f}%"
+        sign = "-" if bps < 0 else ""
+        whole, hundredths = divmod(abs(bps), 100)
+        return f"{sign}{whole}.{hundredths:02d}%"
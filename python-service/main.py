@@ -3,19 +3,19 @@ MicroPaper Python FastAPI Service
 Main application entry point
 """
 
-from fastapi import FastAPI, Request, status
+from fastapi import FastAPI, Request, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
-from sqlalchemy import text
 import logging
 import sys
 
 from app.config import settings
-from app.database import init_db, close_db
+from app.database import init_db, close_db, probe_database
 from app.middleware.auth import validate_api_key
 from app.middleware.request_id import add_request_id_middleware
 from app.routes import custodian, compliance, market
+from app.services.order_writer import order_writer
 
 # Configure logging
 logging.basicConfig(
@@ -41,6 +41,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down MicroPaper Python API Service")
+    await order_writer.close()
     await close_db()
 
 
@@ -66,45 +67,35 @@ app.add_middleware(
 app.middleware("http")(add_request_id_middleware)
 
 
-# API Key authentication dependency (exclude health checks)
+class APIKeyRejected(Exception):
+    """Raised by api_key_dependency; rendered as the service's 401 error body"""
+
+
+# API Key authentication dependency, attached to the protected routers below
+# (/, /health and the docs are registered on the app itself and need no key)
 async def api_key_dependency(request: Request):
     """Dependency to validate API key for protected routes"""
-    # Skip authentication for health checks and root endpoint
-    if request.url.path in ["/health", "/", "/docs", "/openapi.json", "/redoc"]:
-        return True
-    
-    # Validate API key for all other routes
-    return await validate_api_key(request)
+    try:
+        return await validate_api_key(request)
+    except HTTPException as e:
+        raise APIKeyRejected(str(e))
 
 
-# Add API key validation to all routes except health checks
-@app.middleware("http")
-async def api_key_middleware(request: Request, call_next):
-    """Middleware to validate API key for protected routes"""
-    # Skip authentication for health checks and docs
-    if request.url.path in ["/health", "/", "/docs", "/openapi.json", "/redoc"]:
-        return await call_next(request)
-    
-    # Skip authentication for OPTIONS requests (CORS preflight)
-    if request.method == "OPTIONS":
-        return await call_next(request)
-    
-    try:
-        await validate_api_key(request)
-    except Exception as e:
-        return JSONResponse(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            content={"error": {"code": "UNAUTHORIZED", "message": str(e)}}
-        )
-    
-    return await call_next(request)
+@app.exception_handler(APIKeyRejected)
+async def api_key_rejected_handler(request: Request, exc: APIKeyRejected):
+    """Return rejected API keys in the standard error format"""
+    return JSONResponse(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        content={"error": {"code": "UNAUTHORIZED", "message": str(exc)}}
+    )
 
 
 # Register routes
 # Use /api/mock/* to match frontend expectations
-app.include_router(custodian.router, prefix="/api/mock/custodian", tags=["Custodian"])
-app.include_router(compliance.router, prefix="/api/mock/compliance", tags=["Compliance"])
-app.include_router(market.router, prefix="/api/market", tags=["Market"])
+protected = [Depends(api_key_dependency)]
+app.include_router(custodian.router, prefix="/api/mock/custodian", tags=["Custodian"], dependencies=protected)
+app.include_router(compliance.router, prefix="/api/mock/compliance", tags=["Compliance"], dependencies=protected)
+app.include_router(market.router, prefix="/api/market", tags=["Market"], dependencies=protected)
 
 
 # Root endpoint
@@ -119,6 +110,7 @@ async def root():
         "endpoints": {
             "custodian": {
                 "issue": "POST /api/mock/custodian/issue",
+                "issueBatch": "POST /api/mock/custodian/issue/batch",
                 "health": "GET /api/mock/custodian/health",
                 "info": "GET /api/mock/custodian/info"
             },
@@ -136,6 +128,7 @@ async def root():
                 "createOrder": "POST /api/market/order",
                 "invest": "POST /api/market/invest [DEPRECATED - use /order]",
                 "matchOrders": "POST /api/market/match/{note_id} [Admin only]",
+                "getMatchJob": "GET /api/market/match/jobs/{job_id} [Admin only]",
                 "settle": "POST /api/market/settle/{note_id} [Admin only]",
                 "getHoldings": "GET /api/market/holdings",
                 "getRiskBreakdown": "GET /api/market/notes/{note_id}/risk-breakdown"
@@ -148,16 +141,7 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Global health check endpoint with database status"""
-    from app.database import engine
-    
-    db_status = "disconnected"
-    if engine:
-        try:
-            async with engine.begin() as conn:
-                await conn.execute(text("SELECT 1"))
-            db_status = "connected"
-        except Exception:
-            db_status = "error"
+    db_status = await probe_database()
     
     return {
         "status": "healthy",
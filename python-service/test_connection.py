@@ -1,30 +1,31 @@
 """Quick database connection test"""
 import asyncio
-from app.database import init_db, get_db
+from app import database
 from app.models.database import WalletVerification
 from sqlalchemy import select
 
 async def test_connection():
     """Test database connection and basic query"""
     print("🔌 Initializing database connection...")
-    await init_db()
+    await database.init_db()
+    
+    if database.async_session_maker is None:
+        print("❌ Database session is None")
+        return
     
     print("✅ Database connection pool initialized")
     
-    # Test a simple query
-    async for db in get_db():
-        if db is None:
-            print("❌ Database session is None")
-            return
-        
-        try:
+    # Test a simple query (session taken straight from the session maker, no dependency generator)
+    try:
+        async with database.async_session_maker() as db:
             result = await db.execute(select(WalletVerification).limit(1))
             print("✅ Database query successful")
             print(f"   Connection pool: Active")
-        except Exception as e:
-            print(f"❌ Database query failed: {e}")
-            return
-        break
+    except Exception as e:
+        print(f"❌ Database query failed: {e}")
+        return
+    finally:
+        await database.close_db()
     
     print("✅ All database tests passed!")
 
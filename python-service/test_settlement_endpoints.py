@@ -5,8 +5,9 @@ Tests the new market API endpoints
 
 import asyncio
 import sys
+import time
 from datetime import datetime, timezone, timedelta
-from app.database import init_db, get_db
+from app import database
 from app.models.database import (
     NoteIssuance, 
     WalletVerification, 
@@ -17,7 +18,12 @@ from app.models.database import (
     OrderStatusEnum
 )
 from app.utils.yield_calculator import YieldCalculator
-from sqlalchemy import select, func
+from sqlalchemy import select, func, insert, update, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+# Statements reused across tests are built once; SQLAlchemy's compiled cache and asyncpg's
+# prepared statement cache then serve repeat executions without recompiling or re-parsing
+NOTE_BY_ID = select(NoteIssuance).where(NoteIssuance.id == bindparam("note_id"))
 
 
 async def test_yield_calculator():
@@ -44,6 +50,21 @@ async def test_yield_calculator():
     )
     print(f"   ✅ From Dates - Maturity: ${maturity_val/100:.2f}, APY: {apy_val:.2f}%")
     
+    # Test 4: Batch sweep over many principals (the path list endpoints use)
+    principals = list(range(10_000, 1_000_000, 1000))
+    started = time.perf_counter()
+    maturity_values, apys = YieldCalculator.calculate_many(
+        principals,
+        [rate_bps] * len(principals),
+        [issued] * len(principals),
+        [maturity_date] * len(principals)
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if maturity_values[-1] != YieldCalculator.calculate_maturity_value(principals[-1], rate_bps, days):
+        print("   ❌ Batch sweep disagrees with calculate_maturity_value")
+        return False
+    print(f"   ✅ Batch Sweep: {len(principals)} notes in {elapsed_ms:.1f} ms")
+    
     return True
 
 
@@ -51,11 +72,11 @@ async def test_database_schema():
     """Test that new tables and columns exist"""
     print("\n🗄️  Testing Database Schema...")
     
-    async for db in get_db():
-        if db is None:
-            print("   ❌ Database session is None")
-            return False
-        
+    if database.async_session_maker is None:
+        print("   ❌ Database session is None")
+        return False
+    
+    async with database.async_session_maker() as db:
         try:
             # Test note_issuances new columns
             result = await db.execute(
@@ -88,7 +109,7 @@ async def test_database_schema():
             
             return True
         except Exception as e:
-            print(f"   ❌ Error: {e}")
+            print(f"   ❌ Error: {e}", flush=True)
             import traceback
             traceback.print_exc()
             return False
@@ -98,29 +119,24 @@ async def test_create_note_with_settlement_fields():
     """Test creating a note with settlement layer fields"""
     print("\n📝 Testing Note Creation with Settlement Fields...")
     
-    async for db in get_db():
-        if db is None:
-            print("   ❌ Database session is None")
-            return False
-        
+    if database.async_session_maker is None:
+        print("   ❌ Database session is None")
+        return False
+    
+    async with database.async_session_maker() as db:
         try:
-            # Create test wallet if it doesn't exist
+            # Create test wallet if it doesn't exist (one INSERT ... ON CONFLICT DO NOTHING,
+            # no existence check; a returned row means it was created)
             test_wallet = "0x1234567890123456789012345678901234567890"
-            wallet_result = await db.execute(
-                select(WalletVerification).where(
-                    WalletVerification.wallet_address == test_wallet
-                )
+            created_wallet = await db.scalar(
+                pg_insert(WalletVerification)
+                .values(wallet_address=test_wallet, is_verified=True, verified_by="test_script")
+                .on_conflict_do_nothing(index_elements=[WalletVerification.wallet_address])
+                .returning(WalletVerification.wallet_address)
             )
-            wallet = wallet_result.scalar_one_or_none()
+            await db.commit()
             
-            if not wallet:
-                wallet = WalletVerification(
-                    wallet_address=test_wallet,
-                    is_verified=True,
-                    verified_by="test_script"
-                )
-                db.add(wallet)
-                await db.commit()
+            if created_wallet:
                 print(f"   ✅ Created test wallet: {test_wallet}")
             
             # Create a note with settlement fields
@@ -160,7 +176,7 @@ async def test_create_note_with_settlement_fields():
             return True, note.id
         except Exception as e:
             await db.rollback()
-            print(f"   ❌ Error: {e}")
+            print(f"   ❌ Error: {e}", flush=True)
             import traceback
             traceback.print_exc()
             return False, None
@@ -170,18 +186,16 @@ async def test_create_order(note_id: int):
     """Test creating an investment order"""
     print("\n💰 Testing Order Creation...")
     
-    async for db in get_db():
-        if db is None:
-            print("   ❌ Database session is None")
-            return False
-        
+    if database.async_session_maker is None:
+        print("   ❌ Database session is None")
+        return False
+    
+    async with database.async_session_maker() as db:
         try:
             test_wallet = "0x1234567890123456789012345678901234567890"
             
             # Get note to check min_subscription_amount
-            note_result = await db.execute(
-                select(NoteIssuance).where(NoteIssuance.id == note_id)
-            )
+            note_result = await db.execute(NOTE_BY_ID, {"note_id": note_id})
             note = note_result.scalar_one_or_none()
             
             if not note:
@@ -210,7 +224,7 @@ async def test_create_order(note_id: int):
             return True, order.id
         except Exception as e:
             await db.rollback()
-            print(f"   ❌ Error: {e}")
+            print(f"   ❌ Error: {e}", flush=True)
             import traceback
             traceback.print_exc()
             return False, None
@@ -220,57 +234,64 @@ async def test_settle_note(note_id: int):
     """Test settling a note"""
     print("\n🏦 Testing Note Settlement...")
     
-    async for db in get_db():
-        if db is None:
-            print("   ❌ Database session is None")
-            return False
-        
+    if database.async_session_maker is None:
+        print("   ❌ Database session is None")
+        return False
+    
+    async with database.async_session_maker() as db:
         try:
             # Get note
-            note_result = await db.execute(
-                select(NoteIssuance).where(NoteIssuance.id == note_id)
-            )
+            note_result = await db.execute(NOTE_BY_ID, {"note_id": note_id})
             note = note_result.scalar_one_or_none()
             
             if not note:
                 print(f"   ❌ Note {note_id} not found")
                 return False
             
-            # Get pending orders
-            orders_result = await db.execute(
-                select(Order).where(
-                    Order.note_id == note_id,
-                    Order.status == OrderStatusEnum.PENDING
-                )
+            pending_filter = (
+                Order.note_id == note_id,
+                Order.status == OrderStatusEnum.PENDING
             )
-            orders = orders_result.scalars().all()
             
-            total_subscribed = sum(o.amount for o in orders)
+            # Total and count the pending orders in SQL (one row back, not every order)
+            summary_result = await db.execute(
+                select(func.coalesce(func.sum(Order.amount), 0), func.count()).where(*pending_filter)
+            )
+            total_subscribed, pending_count = summary_result.one()
             print(f"   📊 Settlement Summary:")
             print(f"      - Note Amount: ${note.amount/100:.2f}")
             print(f"      - Total Subscribed: ${total_subscribed/100:.2f}")
-            print(f"      - Pending Orders: {len(orders)}")
+            print(f"      - Pending Orders: {pending_count}")
             
             if total_subscribed < note.amount:
                 print(f"   ⚠️  Note not fully subscribed (need ${(note.amount - total_subscribed)/100:.2f} more)")
                 return False
             
-            # Create holdings and update orders
-            filled_at = datetime.now(timezone.utc)
-            holdings_created = 0
+            # Only now fetch the orders, and only the columns the holdings need
+            orders_result = await db.execute(
+                select(Order.id, Order.investor_wallet, Order.amount).where(*pending_filter)
+            )
+            orders = orders_result.all()
             
-            for order in orders:
-                holding = InvestorHolding(
-                    wallet_address=order.investor_wallet,
-                    note_id=note.id,
-                    quantity_held=order.amount,
-                    acquisition_price=10000  # $100 per unit
+            # Create holdings (one executemany INSERT) and fill the orders (one UPDATE)
+            filled_at = datetime.now(timezone.utc)
+            holdings = [
+                {
+                    "wallet_address": order.investor_wallet,
+                    "note_id": note.id,
+                    "quantity_held": order.amount,
+                    "acquisition_price": 10000  # $100 per unit
+                }
+                for order in orders
+            ]
+            if holdings:
+                await db.execute(insert(InvestorHolding), holdings)
+                await db.execute(
+                    update(Order)
+                    .where(Order.id.in_([order.id for order in orders]))
+                    .values(status=OrderStatusEnum.FILLED, filled_at=filled_at)
                 )
-                db.add(holding)
-                holdings_created += 1
-                
-                order.status = OrderStatusEnum.FILLED
-                order.filled_at = filled_at
+            holdings_created = len(holdings)
             
             note.offering_status = OfferingStatusEnum.SETTLED
             await db.commit()
@@ -283,44 +304,61 @@ async def test_settle_note(note_id: int):
             return True
         except Exception as e:
             await db.rollback()
-            print(f"   ❌ Error: {e}")
+            print(f"   ❌ Error: {e}", flush=True)
             import traceback
             traceback.print_exc()
             return False
 
 
-async def main():
-    """Run all tests"""
+async def main() -> bool:
+    """Run all tests; returns False if a required test failed"""
     print("🚀 Starting Settlement Layer Tests\n")
     
-    await init_db()
-    
-    # Test 1: Yield Calculator
-    await test_yield_calculator()
-    
-    # Test 2: Database Schema
-    schema_ok = await test_database_schema()
-    if not schema_ok:
-        print("\n❌ Schema test failed. Exiting.")
-        return
-    
-    # Test 3: Create note with settlement fields
-    note_ok, note_id = await test_create_note_with_settlement_fields()
-    if not note_ok or not note_id:
-        print("\n❌ Note creation test failed. Exiting.")
-        return
+    # One engine and pool for the whole run; each test opens its session from it
+    await database.init_db()
     
-    # Test 4: Create order
-    order_ok, order_id = await test_create_order(note_id)
-    if not order_ok:
-        print("\n⚠️  Order creation test failed (may need more orders for settlement)")
-    
-    # Test 5: Settle note (if fully subscribed)
-    if order_ok:
-        await test_settle_note(note_id)
-    
-    print("\n✅ All tests completed!")
+    try:
+        # Tests 1 and 2: Database Schema and Yield Calculator are independent, so they run
+        # together; the schema check goes first so the calculator runs while its query is in flight
+        schema_ok, yield_ok = await asyncio.gather(test_database_schema(), test_yield_calculator())
+        if not schema_ok:
+            print("\n❌ Schema test failed. Exiting.")
+            return False
+        if not yield_ok:
+            print("\n❌ Yield calculator test failed. Exiting.")
+            return False
+        
+        # Test 3: Create note with settlement fields
+        note_ok, note_id = await test_create_note_with_settlement_fields()
+        if not note_ok or not note_id:
+            print("\n❌ Note creation test failed. Exiting.")
+            return False
+        
+        # Test 4: Create order
+        order_ok, order_id = await test_create_order(note_id)
+        if not order_ok:
+            print("\n⚠️  Order creation test failed (may need more orders for settlement)")
+        
+        # Test 5: Settle note (if fully subscribed)
+        if order_ok:
+            await test_settle_note(note_id)
+        
+        print("\n✅ All tests completed!")
+        return True
+    finally:
+        await database.close_db()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Block-buffer stdout even on a terminal (flushed at exit); error lines flush themselves
+    # so they stay in order with the traceback printed to stderr
+    sys.stdout.reconfigure(line_buffering=False)
+    
+    # Run on uvloop (installed with uvicorn[standard]) when available for cheaper socket I/O
+    try:
+        import uvloop
+    except ImportError:
+        ok = asyncio.run(main())
+    else:
+        ok = uvloop.run(main())
+    sys.exit(0 if ok else 1)